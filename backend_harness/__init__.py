@@ -0,0 +1 @@
+"""Settings, clients and workload runners used by backend_test.py"""
\ No newline at end of file
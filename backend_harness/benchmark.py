@@ -0,0 +1,132 @@
+"""Benchmark JSON output and latency regression checks against a baseline"""
+
+import json
+import math
+import os
+from datetime import datetime
+
+from .config import API_BASE
+from .stats import LatencyHistogram, mann_whitney_greater
+
+
+BENCHMARK_FILE = os.getenv('API_TEST_BENCHMARK_FILE', 'benchmark-results.json')
+BASELINE_FILE = os.getenv('API_TEST_BASELINE_FILE')
+
+# Fewer successful samples than this per side are too few for the rank test
+MIN_REGRESSION_SAMPLES = 20
+# Below MIN_REGRESSION_SAMPLES a route regresses only if its median slowed by more than this
+SMALL_SAMPLE_SLOWDOWN = 1.0
+
+
+def build_benchmark(mode, results, base_url=API_BASE):
+    """Machine-readable summary of one run, keyed by endpoint/scenario"""
+    endpoints = {}
+    for result in results:
+        endpoints[result.key] = {
+            'requests': result.requests,
+            'errors': result.errors,
+            'throughput_rps': round(result.throughput, 3),
+            'bytes_per_response': round(result.bytes_received / result.requests, 1) if result.requests else 0,
+            'latency_ms': {f"p{pct:g}": None if math.isnan(value) else value
+                           for pct, value in result.percentiles().items()},
+            'histogram': result.histogram.to_dict(),
+        }
+    return {
+        'mode': mode,
+        'base_url': base_url,
+        'timestamp': datetime.now().isoformat(),
+        'endpoints': endpoints,
+    }
+
+
+def write_benchmark(path, benchmark):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(benchmark, handle, indent=2)
+
+
+def load_benchmark(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def compare_to_baseline(benchmark, baseline, tolerance=0.10, alpha=0.01):
+    """Return (regressions, skipped, compared) against a baseline benchmark.
+
+    `regressions` and `skipped` are lists of (endpoint, details); `compared`
+    counts the endpoints that were actually tested.
+
+    With at least MIN_REGRESSION_SAMPLES on both sides, a regression needs
+    both statistical significance (Mann-Whitney p < alpha) and a median
+    slowdown beyond `tolerance`, so noise and tiny-but-significant shifts on
+    large runs are both ignored. The rank test compares whole distributions,
+    so the median is the matching effect size; p99 is reported for context.
+
+    With fewer samples (the functional run sends each request only a few
+    times) the rank test has no power, so a route regresses when its median
+    slowed by more than SMALL_SAMPLE_SLOWDOWN (or `tolerance`, if larger).
+    """
+    if benchmark['mode'] != baseline.get('mode'):
+        return [], [('*', f"baseline mode {baseline.get('mode')!r} does not match {benchmark['mode']!r}")], 0
+    regressions, skipped = [], []
+    compared = 0
+    for key, current in benchmark['endpoints'].items():
+        previous = baseline['endpoints'].get(key)
+        if previous is None:
+            skipped.append((key, "not in baseline"))
+            continue
+        current_hist = LatencyHistogram.from_dict(current['histogram'])
+        baseline_hist = LatencyHistogram.from_dict(previous['histogram'])
+        samples = min(current_hist.total_count, baseline_hist.total_count)
+        before, after = previous['latency_ms'], current['latency_ms']
+        if not samples or not before['p50']:
+            skipped.append((key, "no successful samples"))
+            continue
+        compared += 1
+        slowdown = after['p50'] / before['p50'] - 1
+        change = f"p50 {before['p50']:.1f} -> {after['p50']:.1f} ms ({slowdown:+.0%}"
+        if samples < MIN_REGRESSION_SAMPLES:
+            if slowdown > max(tolerance, SMALL_SAMPLE_SLOWDOWN):
+                regressions.append((key, f"{change}, threshold test on n={samples})"))
+            continue
+        _, p_value = mann_whitney_greater(baseline_hist, current_hist)
+        if p_value < alpha and slowdown > tolerance:
+            regressions.append((key, f"{change}, p={p_value:.2g}), "
+                                     f"p99 {before['p99']:.1f} -> {after['p99']:.1f} ms"))
+    for key in baseline['endpoints'].keys() - benchmark['endpoints'].keys():
+        skipped.append((key, "missing from this run"))
+    return regressions, skipped, compared
+
+
+def record_benchmark(mode, results, benchmark_file=BENCHMARK_FILE, baseline_file=BASELINE_FILE,
+                     tolerance=0.10, alpha=0.01, update_baseline=False, base_url=API_BASE):
+    """Write this run's benchmark, compare it to the baseline and report.
+
+    Returns True when no latency regression was found.
+    """
+    benchmark = build_benchmark(mode, results, base_url)
+    if benchmark_file:
+        write_benchmark(benchmark_file, benchmark)
+        print(f"\n💾 Benchmark written to {benchmark_file}")
+
+    regressions = []
+    if baseline_file and os.path.exists(baseline_file):
+        regressions, skipped, compared = compare_to_baseline(benchmark, load_benchmark(baseline_file),
+                                                             tolerance, alpha)
+        if skipped:
+            print(f"\n⚠️  Not compared with {baseline_file}:")
+            for key, reason in skipped:
+                print(f"   • {key}: {reason}")
+        if regressions:
+            print(f"\n🐢 LATENCY REGRESSIONS vs {baseline_file}:")
+            for key, details in regressions:
+                print(f"   • {key}: {details}")
+        elif compared:
+            print(f"✅ No latency regressions in {compared} endpoints vs {baseline_file} "
+                  f"(tolerance {tolerance:.0%}, alpha {alpha:g})")
+        else:
+            print(f"⚠️  Nothing could be compared with {baseline_file}")
+
+    if baseline_file and update_baseline and not regressions:
+        write_benchmark(baseline_file, benchmark)
+        print(f"📌 Baseline updated: {baseline_file}")
+    return not regressions
\ No newline at end of file
@@ -0,0 +1,295 @@
+"""HTTP clients: a phase-timed requests session and a minimal asyncio keep-alive client"""
+
+import asyncio
+import json
+import re
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+from .config import API_BASE, POOL_SIZE, MAX_RETRIES, RETRY_BACKOFF
+
+
+# Connection-setup phases (dns, connect, tls) accumulated by the current thread's request
+connection_phases = threading.local()
+
+
+def _add_connection_phase(name, elapsed_ms):
+    phases = getattr(connection_phases, 'phases', None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + elapsed_ms
+
+
+class _TimedConnectionMixin:
+    """Times DNS resolution and TCP connect separately when a socket is opened.
+
+    The name is resolved up front and the first address is dialled directly;
+    if that fails the normal resolve-and-connect path is used instead.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            address = None
+        resolved = time.perf_counter()
+        _add_connection_phase('dns', (resolved - start) * 1000)
+        try:
+            if address is None:
+                return super()._new_conn()
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except NewConnectionError:
+                self._dns_host = host
+                return super()._new_conn()
+        finally:
+            self._dns_host = host
+            _add_connection_phase('connect', (time.perf_counter() - resolved) * 1000)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        phases = getattr(connection_phases, 'phases', None) or {}
+        before = phases.get('dns', 0.0) + phases.get('connect', 0.0)
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            # Whatever connect() spent beyond opening the socket is the handshake
+            opened = phases.get('dns', 0.0) + phases.get('connect', 0.0) - before
+            _add_connection_phase('tls', (time.perf_counter() - start) * 1000 - opened)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report their setup phases"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+def parse_server_timing(header):
+    """Map each Server-Timing metric name to its duration in ms (None if absent)"""
+    metrics = {}
+    for entry in re.findall(r'(?:[^,"]|"[^"]*")+', header or ''):
+        name, *params = [part.strip() for part in entry.split(';')]
+        if not name:
+            continue
+        duration = None
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'dur':
+                try:
+                    duration = float(value.strip().strip('"'))
+                except ValueError:
+                    pass
+        metrics[name] = duration
+    return metrics
+
+
+def create_session(pool_size=POOL_SIZE, max_retries=MAX_RETRIES, backoff_factor=RETRY_BACKOFF):
+    """Create a keep-alive session with a bounded connection pool.
+
+    Only idempotent methods are retried, so a flaky gateway never causes a
+    duplicate agency, review or contact submission.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'PUT', 'DELETE', 'OPTIONS']),
+        raise_on_status=False,
+    )
+    adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncResponse:
+    """Status, lower-cased headers and raw body of an AsyncHTTPClient response"""
+    __slots__ = ('status', 'headers', 'body', 'first_byte_at')
+
+    def __init__(self, status, headers, body, first_byte_at=None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.first_byte_at = first_byte_at
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class AsyncHTTPClient:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams.
+
+    Each load worker owns one client, i.e. one persistent connection, so the
+    number of workers is exactly the number of in-flight requests.
+    """
+
+    def __init__(self, base_url=API_BASE, timeout=10):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.https = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.https else 80)
+        self.base_path = parts.path.rstrip('/')
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._got_status = False
+
+    async def _connect(self):
+        ssl_context = ssl.create_default_context() if self.https else None
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl_context,
+            server_hostname=self.host if self.https else None)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+        self._reader = self._writer = None
+
+    def _build_request(self, method, path, params, json_body, headers):
+        target = self.base_path + path
+        if params:
+            target += '?' + urlencode(params)
+        body = json.dumps(json_body).encode() if json_body is not None else b''
+        fields = {'Accept': 'application/json'}
+        if json_body is not None:
+            fields['Content-Type'] = 'application/json'
+        fields.update(headers or {})
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host_header}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in fields.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+    async def _read_response(self, method, on_chunk=None):
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        first_byte_at = time.perf_counter()
+        self._got_status = True
+        status = int(status_line.split(b' ', 2)[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        # Streamed bodies go to on_chunk piece by piece and are never buffered
+        chunks = []
+        sink = on_chunk or chunks.append
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self._reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                sink(await self._reader.readexactly(size))
+                await self._reader.readline()
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining:
+                piece = await self._reader.readexactly(min(remaining, STREAM_CHUNK_SIZE) if on_chunk else remaining)
+                sink(piece)
+                remaining -= len(piece)
+        else:
+            while True:
+                piece = await self._reader.read(STREAM_CHUNK_SIZE)
+                if not piece:
+                    break
+                sink(piece)
+            headers['connection'] = 'close'
+        return AsyncResponse(status, headers, b''.join(chunks), first_byte_at)
+
+    async def request(self, method, path, params=None, json_body=None, headers=None, on_chunk=None):
+        """Send one request, reconnecting once if a reused connection went stale.
+
+        With `on_chunk`, the body is handed over as it arrives and the
+        returned response has an empty body.
+        """
+        payload = self._build_request(method, path, params, json_body, headers)
+        for attempt in (0, 1):
+            reused = self._writer is not None
+            if not reused:
+                await self._connect()
+            self._got_status = False
+            try:
+                self._writer.write(payload)
+                await self._writer.drain()
+                response = await asyncio.wait_for(self._read_response(method, on_chunk), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                # Only a connection that died before answering is safe to retry
+                if reused and attempt == 0 and not self._got_status:
+                    continue
+                raise
+            except BaseException:
+                await self.close()
+                raise
+            if response.headers.get('connection', '').lower() == 'close':
+                await self.close()
+            return response
+
+
+class AsyncClientPool:
+    """Bounded pool of AsyncHTTPClient connections shared by many tasks"""
+
+    def __init__(self, base_url=API_BASE, max_connections=256, timeout=10):
+        self._clients = [AsyncHTTPClient(base_url, timeout) for _ in range(max_connections)]
+        # LIFO hands out the most recently used, already connected client first
+        self._idle = asyncio.LifoQueue()
+        for client in self._clients:
+            self._idle.put_nowait(client)
+
+    async def request(self, method, path, **kwargs):
+        client = await self._idle.get()
+        try:
+            return await client.request(method, path, **kwargs)
+        finally:
+            self._idle.put_nowait(client)
+
+    async def close(self):
+        await asyncio.gather(*(client.close() for client in self._clients))
\ No newline at end of file
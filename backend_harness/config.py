@@ -0,0 +1,34 @@
+"""Target URLs, connection settings and the location CSV shared by every mode"""
+
+import csv
+import os
+
+
+# Get base URL from environment
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
+API_BASE = f"{BASE_URL}/api"
+
+# Every /foster-agency/<country>/<region>/<city> landing page on the site
+LOCATIONS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'uk-foster-agency-location-urls.csv')
+
+# Connection pool and retry settings for the shared session
+POOL_SIZE = int(os.getenv('API_TEST_POOL_SIZE', '10'))
+MAX_RETRIES = int(os.getenv('API_TEST_MAX_RETRIES', '2'))
+RETRY_BACKOFF = float(os.getenv('API_TEST_RETRY_BACKOFF', '0.2'))
+
+# Filter combinations shared by test_list_agencies and the load generator
+AGENCY_LIST_FILTERS = [
+    ("Basic list", {}),
+    ("Featured agencies", {"featured": "true"}),
+    ("Search by location", {"search": "London"}),
+    ("Filter by type", {"type": "Private"}),
+    ("Pagination", {"page": "1", "limit": "3"})
+]
+
+
+def read_locations(path=LOCATIONS_CSV):
+    """Yield (country, region, city, url) rows from the location URL CSV"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            yield row['country'], row['region_or_county'], row['city_or_district'], row['url']
\ No newline at end of file
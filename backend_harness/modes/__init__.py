@@ -0,0 +1 @@
+"""Workload runners behind the backend_test.py mode flags"""
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""Contact-endpoint load with email-provider latency isolated through the sink"""
+
+import asyncio
+import random
+import time
+import uuid
+
+from ..config import API_BASE
+from ..client import AsyncHTTPClient, AsyncClientPool
+from ..stats import LoadResult, print_load_table
+
+
+CONTACT_ENDPOINTS = ('/contact/agency', '/contact/general')
+
+
+class ContactSample:
+    __slots__ = ('endpoint', 'tag', 'latency_ms', 'status', 'email_error', 'email_ms')
+
+    def __init__(self, endpoint, tag, latency_ms, status, email_error):
+        self.endpoint = endpoint
+        self.tag = tag
+        self.latency_ms = latency_ms
+        self.status = status
+        self.email_error = email_error
+        self.email_ms = None
+
+
+class ContactReport:
+    """End-to-end latency of contact submissions split into email delivery and the rest"""
+
+    def __init__(self, concurrency):
+        self.total = {endpoint: LoadResult(f"POST {endpoint}", concurrency) for endpoint in CONTACT_ENDPOINTS}
+        self.email = {endpoint: LoadResult("  email provider", concurrency) for endpoint in CONTACT_ENDPOINTS}
+        self.rest = {endpoint: LoadResult("  everything else", concurrency) for endpoint in CONTACT_ENDPOINTS}
+        self.samples = []
+        self.untracked = 0
+        self.email_failures = 0
+        self.other_failures = 0
+        self.aborted = False
+
+    def tail_email_share(self, endpoint, pct=99):
+        """Mean fraction of latency spent on email among requests slower than the pct percentile"""
+        attributed = sorted((sample.latency_ms, sample.email_ms) for sample in self.samples
+                            if sample.endpoint == endpoint and sample.email_ms is not None)
+        if not attributed:
+            return None
+        tail = attributed[int(len(attributed) * pct / 100):] or attributed[-1:]
+        return sum(min(email_ms / latency_ms, 1.0) for latency_ms, email_ms in tail) / len(tail)
+
+
+async def _sink_log(sink_url, timeout):
+    sink = AsyncHTTPClient(sink_url, timeout)
+    try:
+        return (await sink.request('GET', '/_sink/log')).json()
+    finally:
+        await sink.close()
+
+
+async def _create_test_agency(pool, mode, contact_email):
+    """Create the throwaway agency that `mode` writes to; returns its id, or None"""
+    try:
+        created = await pool.request('POST', '/agencies', json_body={
+            'name': f"{mode.replace('-', ' ').title()} Test Agency {uuid.uuid4().hex[:8]}",
+            'description': f"Temporary agency created by backend_test.py --{mode}",
+            'location': {'city': 'Test City', 'region': 'Test Region', 'postcode': 'TE1 1ST'},
+            'type': 'Private',
+            'contactEmail': contact_email,
+        })
+    except Exception as e:
+        print(f"❌ Could not create the {mode} test agency: {e}")
+        return None
+    if created.status != 201:
+        print(f"❌ Could not create the {mode} test agency (HTTP {created.status})")
+        return None
+    return created.json()['agency']['id']
+
+
+async def _delete_test_agency(pool, mode, agency_id):
+    """Best-effort cleanup that never masks the error that ended the run"""
+    try:
+        deleted = (await pool.request('DELETE', f"/agencies/{agency_id}")).status == 200
+    except Exception:
+        deleted = False
+    print(f"🧹 {'Deleted' if deleted else 'Could not delete'} {mode} test agency {agency_id}")
+
+
+async def _probe_sink(pool, agency_id, sink_url, tag, contact_email, timeout):
+    """Send one tagged inquiry and check that its email reached the sink, not a real provider"""
+    try:
+        await pool.request('POST', '/contact/agency', json_body={
+            'agencyId': agency_id, 'name': "Load Test Probe", 'email': contact_email,
+            'message': f"Load test probe, please ignore [lt-{tag}]"})
+        if tag in await _sink_log(sink_url, timeout):
+            return True
+    except Exception as e:
+        print(f"❌ The sink probe failed: {e}. Aborting before sending real email.")
+        return False
+    print(f"❌ The probe email never reached the sink; set RESEND_BASE_URL={sink_url} "
+          f"for the API under test. Aborting before sending real email.")
+    return False
+
+
+async def _run_contact_load(base_url, sink_url, total, concurrency, seed, timeout):
+    rng = random.Random(seed)
+    report = ContactReport(concurrency)
+    setup = AsyncClientPool(base_url, 1, timeout)
+    agency_id = None
+    try:
+        # Inquiries go to a throwaway agency, never to a real one from the listing
+        agency_id = await _create_test_agency(setup, 'contact-load', 'contact-load@testfoster.co.uk')
+        # One probe first: if its email bypasses the sink, the API is wired to the real provider
+        tag = uuid.UUID(int=rng.getrandbits(128)).hex[:12]
+        if agency_id is None or not await _probe_sink(setup, agency_id, sink_url, tag,
+                                                      'contact-load@testfoster.co.uk', timeout):
+            report.aborted = True
+            return report
+
+        plan = []
+        for i in range(total):
+            tag = uuid.UUID(int=rng.getrandbits(128)).hex[:12]
+            endpoint = CONTACT_ENDPOINTS[i % 2]
+            body = {'name': f"Contact Load {i}", 'email': f"contact-load-{i}@testfoster.co.uk",
+                    'message': f"Load test inquiry, please ignore [lt-{tag}]"}
+            if endpoint == '/contact/agency':
+                body['agencyId'] = agency_id
+            plan.append((endpoint, tag, body))
+        steps = iter(plan)
+
+        async def worker():
+            client = AsyncHTTPClient(base_url, timeout)
+            try:
+                for endpoint, tag, body in steps:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.request('POST', endpoint, json_body=body)
+                        status = response.status
+                        # Same rule as test_contact_agency: a 500 about email is a delivery failure
+                        email_error = status == 500 and 'email' in response.body.decode('utf-8', 'replace').lower()
+                    except Exception:
+                        status, email_error = None, False
+                    latency_ms = (time.perf_counter() - start) * 1000
+                    report.total[endpoint].record(latency_ms, status == 200)
+                    report.samples.append(ContactSample(endpoint, tag, latency_ms, status, email_error))
+            finally:
+                await client.close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+        deliveries = await _sink_log(sink_url, timeout)
+    finally:
+        if agency_id is not None:
+            await _delete_test_agency(setup, 'contact', agency_id)
+        await setup.close()
+
+    for sample in report.samples:
+        if sample.status != 200:
+            if sample.email_error:
+                report.email_failures += 1
+            else:
+                report.other_failures += 1
+            continue
+        delivery = deliveries.get(sample.tag)
+        if delivery is None:
+            report.untracked += 1
+            continue
+        sample.email_ms = min(delivery['ms'], sample.latency_ms)
+        report.email[sample.endpoint].record(sample.email_ms, True)
+        report.rest[sample.endpoint].record(sample.latency_ms - sample.email_ms, True)
+    for results in (report.total, report.email, report.rest):
+        for result in results.values():
+            result.duration = duration
+    return report
+
+
+def run_contact_load(base_url=API_BASE, sink_url=None, total=200, concurrency=16, seed=None, timeout=15):
+    """Concurrent contact submissions with email time attributed through the local sink"""
+    print(f"📨 Contact endpoint load against {base_url}, email sink at {sink_url}")
+    print(f"   {total} submissions, concurrency {concurrency}")
+    print("=" * 60)
+    report = asyncio.run(_run_contact_load(base_url, sink_url, total, concurrency, seed, timeout))
+    if report.aborted:
+        return report
+
+    print("\n" + "=" * 60)
+    print("📊 CONTACT LATENCY BREAKDOWN")
+    print("=" * 60)
+    rows = []
+    for endpoint in CONTACT_ENDPOINTS:
+        if report.total[endpoint].requests:
+            rows += [report.total[endpoint], report.email[endpoint], report.rest[endpoint]]
+    print_load_table(rows)
+
+    print(f"\n   Failed submissions: {report.email_failures} email delivery, {report.other_failures} other")
+    if report.untracked:
+        print(f"   ⚠️  {report.untracked} successful submissions never reached the sink; "
+              f"set RESEND_BASE_URL={sink_url} for the API under test")
+    for endpoint in CONTACT_ENDPOINTS:
+        email, rest, end_to_end = report.email[endpoint], report.rest[endpoint], report.total[endpoint]
+        if not email.successes:
+            continue
+        median = end_to_end.percentiles()[50]
+        tail_share = report.tail_email_share(endpoint)
+        email_500s = sum(1 for sample in report.samples if sample.endpoint == endpoint and sample.email_error)
+        print(f"\n   POST /api{endpoint}")
+        print(f"     Email share of latency: {email.percentiles()[50] / median if median else 0:.0%} at p50, "
+              f"{tail_share:.0%} in the slowest 1%")
+        print(f"     Delivery on a background queue: p50 {median:.1f} → {rest.percentiles()[50]:.1f}ms, "
+              f"p99 {end_to_end.percentiles()[99]:.1f} → {rest.percentiles()[99]:.1f}ms"
+              f"{f', and {email_500s} fewer 500s' if email_500s else ''}")
+    return report
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""Concurrent crawler for the location landing pages"""
+
+import asyncio
+import heapq
+import os
+import time
+
+from ..config import LOCATIONS_CSV, read_locations
+from ..client import AsyncHTTPClient
+from ..stats import LatencyHistogram, LoadResult
+
+
+# Cache statuses that mean the page was served without rendering
+CACHED_STATUSES = ('HIT', 'STALE', 'PRERENDER', 'REVALIDATED')
+
+
+class PageFetch:
+    """Timing and caching headers for one crawled location page"""
+    __slots__ = ('url', 'status', 'ttfb_ms', 'total_ms', 'bytes', 'encoding',
+                 'cache_control', 'age', 'cache_status')
+
+    def __init__(self, url, status=None, ttfb_ms=None, total_ms=None, nbytes=0, headers=None):
+        headers = headers or {}
+        self.url = url
+        self.status = status
+        self.ttfb_ms = ttfb_ms
+        self.total_ms = total_ms
+        self.bytes = nbytes
+        self.encoding = headers.get('content-encoding', 'identity')
+        self.cache_control = headers.get('cache-control', '')
+        age = headers.get('age', '')
+        # Seconds the cached copy has been held, as sent by the CDN
+        self.age = int(age) if age.isdigit() else None
+        self.cache_status = headers.get('x-vercel-cache', '').upper()
+
+    @property
+    def ok(self):
+        return self.status is not None and 200 <= self.status < 400
+
+    @property
+    def cached(self):
+        return self.cache_status in CACHED_STATUSES
+
+    @property
+    def dynamic(self):
+        """Marked uncacheable, so every request renders the page on the server"""
+        directives = self.cache_control.lower()
+        return (self.cache_status == 'BYPASS'
+                or 'no-store' in directives or 'private' in directives)
+
+
+class CrawlPass:
+    """Running aggregates for one pass over every location URL"""
+
+    def __init__(self, name, slowest=10, max_listed=50):
+        self.name = name
+        self.result = LoadResult(f"crawl {name}")
+        self.ttfb = LatencyHistogram()
+        self.cache_statuses = {}
+        self.encodings = {}
+        self.slowest_count = slowest
+        self.max_listed = max_listed
+        self._slowest = []        # min-heap of (total_ms, url)
+        self.dynamic = 0
+        self.dynamic_urls = []
+        self.uncached = 0
+        self.uncached_urls = []
+        self.ages = []
+        self.failed_urls = []
+
+    def add(self, fetch):
+        self.result.record(fetch.total_ms, fetch.ok, fetch.bytes)
+        if not fetch.ok:
+            if len(self.failed_urls) < self.max_listed:
+                self.failed_urls.append((fetch.url, fetch.status))
+            return
+        self.ttfb.record(fetch.ttfb_ms)
+        status = fetch.cache_status or 'none'
+        self.cache_statuses[status] = self.cache_statuses.get(status, 0) + 1
+        self.encodings[fetch.encoding] = self.encodings.get(fetch.encoding, 0) + 1
+        if fetch.age is not None:
+            self.ages.append(fetch.age)
+        if fetch.dynamic:
+            self.dynamic += 1
+            if len(self.dynamic_urls) < self.max_listed:
+                self.dynamic_urls.append(fetch.url)
+        if not fetch.cached:
+            self.uncached += 1
+            if len(self.uncached_urls) < self.max_listed:
+                self.uncached_urls.append(fetch.url)
+        entry = (fetch.total_ms, fetch.url)
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def slowest(self):
+        return sorted(self._slowest, reverse=True)
+
+    @property
+    def hit_rate(self):
+        served = sum(self.cache_statuses.values())
+        hits = sum(count for status, count in self.cache_statuses.items() if status in CACHED_STATUSES)
+        return hits / served if served else 0.0
+
+
+async def _fetch_page(client, url):
+    start = time.perf_counter()
+    nbytes = 0
+
+    def on_chunk(chunk):
+        nonlocal nbytes
+        nbytes += len(chunk)
+
+    try:
+        # Ask for compression so Content-Encoding reflects what browsers get;
+        # the body is only counted, never decoded.
+        response = await client.request('GET', url, on_chunk=on_chunk, headers={
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate, br',
+        })
+    except Exception:
+        return PageFetch(url, total_ms=(time.perf_counter() - start) * 1000)
+    return PageFetch(url, response.status, (response.first_byte_at - start) * 1000,
+                     (time.perf_counter() - start) * 1000, nbytes, response.headers)
+
+
+async def crawl_pass(name, site_url, concurrency, timeout=10, slowest=10, csv_path=LOCATIONS_CSV):
+    """Fetch every URL in the location CSV with `concurrency` pooled connections"""
+    crawl = CrawlPass(name, slowest)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        client = AsyncHTTPClient(site_url, timeout)
+        try:
+            while True:
+                url = await queue.get()
+                if url is None:
+                    return
+                crawl.add(await _fetch_page(client, url))
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    # The CSV is streamed into a bounded queue rather than loaded up front
+    for _, _, _, url in read_locations(csv_path):
+        await queue.put(url)
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    crawl.result.duration = time.perf_counter() - started
+    return crawl
+
+
+def _print_crawl_pass(crawl):
+    result = crawl.result
+    print(f"\n🕸️  {crawl.name.upper()} PASS: {result.requests} pages in {result.duration:.2f} s "
+          f"({result.throughput:.1f} pages/s), {result.errors} failed")
+    if result.successes:
+        total = result.percentiles()
+        print(f"   TTFB  p50 {crawl.ttfb.value_at_percentile(50):.1f} ms, "
+              f"p99 {crawl.ttfb.value_at_percentile(99):.1f} ms")
+        print(f"   Total p50 {total[50]:.1f} ms, p99 {total[99]:.1f} ms; "
+              f"avg {result.bytes_received / result.requests / 1024:.1f} KiB per page")
+        print(f"   Encodings: {', '.join(f'{k} {v}' for k, v in sorted(crawl.encodings.items()))}")
+        print(f"   Cache: {', '.join(f'{k} {v}' for k, v in sorted(crawl.cache_statuses.items()))} "
+              f"(hit rate {crawl.hit_rate:.0%})")
+        if crawl.ages:
+            # Old copies on a warm pass mean pages are served stale between revalidations
+            ages = sorted(crawl.ages)
+            print(f"   Age: median {ages[len(ages) // 2]} s, max {ages[-1]} s "
+                  f"over {len(ages)} responses with an Age header")
+        print(f"   Rendered dynamically (no-store/private/BYPASS): {crawl.dynamic}")
+        for url in crawl.dynamic_urls[:10]:
+            print(f"      • {url}")
+        if crawl.name == 'warm' and crawl.uncached:
+            # After a cold pass every cacheable page should have been a HIT
+            print(f"   Still not served from cache: {crawl.uncached}")
+            for url in crawl.uncached_urls[:10]:
+                print(f"      • {url}")
+        print("   Slowest pages:")
+        for total_ms, url in crawl.slowest:
+            print(f"      {total_ms:>8.1f} ms  {url}")
+    for url, status in crawl.failed_urls[:10]:
+        print(f"   ❌ {url}: {status if status is not None else 'request failed'}")
+
+
+def run_crawl(site_url, concurrency=16, warm_pass=False, timeout=10, slowest=10):
+    """Crawl the location landing pages once, or cold then warm"""
+    print(f"🕷️  Crawling location pages from {os.path.basename(LOCATIONS_CSV)} against {site_url}")
+    print(f"   Concurrency {concurrency}{'; cold then warm pass' if warm_pass else ''}")
+    print("=" * 60)
+    passes = [asyncio.run(crawl_pass('cold', site_url, concurrency, timeout, slowest))]
+    _print_crawl_pass(passes[0])
+    if warm_pass:
+        passes.append(asyncio.run(crawl_pass('warm', site_url, concurrency, timeout, slowest)))
+        _print_crawl_pass(passes[1])
+        cold, warm = (p.result.percentiles()[50] for p in passes)
+        print(f"\n📊 Cache effectiveness: hit rate {passes[0].hit_rate:.0%} -> {passes[1].hit_rate:.0%}, "
+              f"p50 {cold:.1f} -> {warm:.1f} ms")
+    return passes
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""Closed-loop and open-loop load generation, sharded over processes"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ..config import API_BASE, AGENCY_LIST_FILTERS
+from ..client import AsyncHTTPClient, AsyncClientPool
+from ..stats import LoadResult, print_load_table
+
+
+# Processes used to generate load; one per core keeps the GIL out of the way
+LOAD_PROCESSES = int(os.getenv('API_TEST_LOAD_PROCESSES', str(os.cpu_count() or 1)))
+
+
+def _split_evenly(total, parts):
+    """Split an integer total into at most `parts` non-zero shares"""
+    shares = [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+    return [share for share in shares if share]
+
+
+def _wait_until(start_at):
+    """Let every worker process start its step at the same wall-clock instant"""
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _run_sharded(executor, worker, shards):
+    """Run worker(*shard) for every shard and merge the LoadResults"""
+    if executor is None:
+        results = [worker(*shard) for shard in shards]
+    else:
+        results = [future.result() for future in [executor.submit(worker, *shard) for shard in shards]]
+    merged = results[0]
+    for result in results[1:]:
+        merged.merge(result)
+    return merged
+
+
+def _load_executor(processes):
+    if processes <= 1:
+        return None
+    # Platform-default start method: shard workers are module-level, so spawn works too
+    return ProcessPoolExecutor(max_workers=processes)
+
+
+def _valid_listing(response):
+    """Cheap structural check mirroring test_list_agencies"""
+    if response.status != 200:
+        return False
+    data = response.json()
+    return 'agencies' in data and 'pagination' in data
+
+
+async def _closed_loop_worker(client, params, deadline, result):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        nbytes = 0
+        try:
+            response = await client.request('GET', '/agencies', params=params)
+            nbytes = len(response.body)
+            ok = _valid_listing(response)
+        except Exception:
+            ok = False
+        result.record((time.perf_counter() - start) * 1000, ok, nbytes)
+
+
+async def run_closed_loop(name, params, concurrency, duration, base_url=API_BASE, timeout=10):
+    """Drive GET /api/agencies from `concurrency` workers for `duration` seconds.
+
+    Each worker sends its next request as soon as the previous one returns, so
+    offered load adapts to the server; this measures throughput, not tail
+    latency under a fixed arrival rate.
+    """
+    result = LoadResult(name, concurrency)
+    clients = [AsyncHTTPClient(base_url, timeout) for _ in range(concurrency)]
+    started = time.perf_counter()
+    deadline = started + duration
+    try:
+        await asyncio.gather(*(_closed_loop_worker(client, params, deadline, result)
+                               for client in clients))
+    finally:
+        result.duration = time.perf_counter() - started
+        await asyncio.gather(*(client.close() for client in clients))
+    return result
+
+
+def _closed_loop_process(name, params, concurrency, duration, base_url, timeout, start_at):
+    _wait_until(start_at)
+    return asyncio.run(run_closed_loop(name, params, concurrency, duration, base_url, timeout))
+
+
+def run_load(concurrency_levels, duration, base_url=API_BASE, timeout=10, processes=LOAD_PROCESSES):
+    """Closed-loop load test of every AGENCY_LIST_FILTERS combination"""
+    print(f"🔥 Closed-loop load test: GET {base_url}/agencies")
+    print(f"   Concurrency {', '.join(map(str, concurrency_levels))}; {duration:g} s per combination; "
+          f"{processes} process(es)")
+    print("=" * 60)
+    results = []
+    executor = _load_executor(processes)
+    try:
+        for name, params in AGENCY_LIST_FILTERS:
+            for concurrency in concurrency_levels:
+                start_at = time.time() + 0.2
+                shards = [(name, params, share, duration, base_url, timeout, start_at)
+                          for share in _split_evenly(concurrency, processes)]
+                result = _run_sharded(executor, _closed_loop_process, shards)
+                result.concurrency = concurrency
+                print(f"   {name} @ {concurrency}: {result.throughput:.1f} req/s, "
+                      f"{result.error_rate:.1%} errors")
+                results.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print("\n" + "=" * 60)
+    print("📊 LOAD SUMMARY")
+    print("=" * 60)
+    print_load_table(results)
+    return results
+
+
+def _valid_detail(response):
+    """Cheap structural check mirroring test_get_single_agency"""
+    return response.status == 200 and 'agency' in response.json()
+
+
+# Read endpoints exercised by the open-loop scheduler: label -> (path builder, validator)
+OPEN_LOOP_ENDPOINTS = {
+    '/api/agencies': (lambda ids, i: '/agencies', _valid_listing),
+    '/api/agencies/:id': (lambda ids, i: f"/agencies/{ids[i % len(ids)]}", _valid_detail),
+}
+
+
+async def _fetch_agency_ids(pool, limit=50):
+    response = await pool.request('GET', '/agencies', params={'limit': str(limit)})
+    if response.status != 200:
+        return []
+    return [agency['id'] for agency in response.json().get('agencies', [])]
+
+
+def fetch_agency_ids(base_url=API_BASE, limit=50, timeout=10):
+    """IDs of the first `limit` listed agencies, or [] if the listing fails"""
+    async def fetch():
+        pool = AsyncClientPool(base_url, 1, timeout)
+        try:
+            return await _fetch_agency_ids(pool, limit)
+        finally:
+            await pool.close()
+    try:
+        return asyncio.run(fetch())
+    except Exception:
+        return []
+
+
+async def _timed_from_intended(pool, path, validator, intended, result):
+    nbytes = 0
+    try:
+        response = await pool.request('GET', path)
+        nbytes = len(response.body)
+        ok = validator(response)
+    except Exception:
+        ok = False
+    # Measured from the scheduled send time, so queueing behind a stalled
+    # server is charged to the request instead of silently omitted.
+    result.record((time.perf_counter() - intended) * 1000, ok, nbytes)
+
+
+async def run_open_loop_step(pool, label, rate, duration, agency_ids, phase=0.0, count=None):
+    """Fire requests at a constant `rate` per second for `duration` seconds.
+
+    `phase` shifts the schedule so several processes sharing one target rate
+    interleave their sends instead of firing in bursts, and `count` is this
+    process's share of the step's requests (default: rate * duration).
+    """
+    build_path, validator = OPEN_LOOP_ENDPOINTS[label]
+    result = LoadResult(label, target_rate=rate)
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(rate * duration) if count is None else count):
+        intended = started + phase + i / rate
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Large lag means the load generator itself is the bottleneck
+        result.max_send_lag_ms = max(result.max_send_lag_ms, (time.perf_counter() - intended) * 1000)
+        tasks.append(asyncio.ensure_future(
+            _timed_from_intended(pool, build_path(agency_ids, i), validator, intended, result)))
+    await asyncio.gather(*tasks)
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _open_loop_process(label, rate, duration, agency_ids, phase, count, base_url, max_connections,
+                       timeout, start_at):
+    async def step():
+        pool = AsyncClientPool(base_url, max_connections, timeout)
+        try:
+            return await run_open_loop_step(pool, label, rate, duration, agency_ids, phase, count)
+        finally:
+            await pool.close()
+    _wait_until(start_at)
+    return asyncio.run(step())
+
+
+def run_open_loop(rates, duration, slo_p99_ms, max_error_rate=0.01, base_url=API_BASE,
+                  max_connections=256, timeout=10, processes=LOAD_PROCESSES):
+    """Ramp a constant arrival rate per read endpoint and report SLO capacity"""
+    print(f"📈 Open-loop rate ramp against {base_url}")
+    print(f"   Rates {', '.join(f'{rate:g}' for rate in rates)} req/s; {duration:g} s per step; "
+          f"SLO p99 <= {slo_p99_ms:g} ms, errors <= {max_error_rate:.1%}; {processes} process(es)")
+    print("=" * 60)
+    agency_ids = fetch_agency_ids(base_url, timeout=timeout)
+    results = []
+    executor = _load_executor(processes)
+    try:
+        for label in OPEN_LOOP_ENDPOINTS:
+            if ':id' in label and not agency_ids:
+                print(f"   {label}: skipped, no agency IDs returned by the listing")
+                continue
+            for rate in rates:
+                # Each process takes an equal share of the rate, offset by its slot; the
+                # step's request total is split whole so truncation can't drop requests per shard
+                start_at = time.time() + 0.2
+                shards = [(label, rate / processes, duration, agency_ids, slot / rate, count, base_url,
+                           max(1, max_connections // processes), timeout, start_at)
+                          for slot, count in enumerate(_split_evenly(int(rate * duration), processes) or [0])]
+                result = _run_sharded(executor, _open_loop_process, shards)
+                result.target_rate = rate
+                result.meets_slo = (result.percentiles()[99] <= slo_p99_ms
+                                    and result.error_rate <= max_error_rate)
+                results.append(result)
+                status = "✅" if result.meets_slo else "❌"
+                print(f"   {status} {label} @ {rate:g} req/s: p99 {result.percentiles()[99]:.1f} ms, "
+                      f"{result.error_rate:.1%} errors, max send lag {result.max_send_lag_ms:.1f} ms")
+                if not result.meets_slo:
+                    # Higher steps would only push a saturated server further
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print("\n" + "=" * 60)
+    print("📊 OPEN-LOOP SUMMARY")
+    print("=" * 60)
+    print_load_table(results)
+    capacity = {}
+    for label in OPEN_LOOP_ENDPOINTS:
+        passing = [r.target_rate for r in results if r.name == label and r.meets_slo]
+        capacity[label] = max(passing) if passing else None
+        if capacity[label] is None:
+            print(f"❌ {label}: SLO missed at every tested rate")
+        else:
+            print(f"✅ {label}: meets SLO up to {capacity[label]:g} req/s")
+    return results, capacity
\ No newline at end of file
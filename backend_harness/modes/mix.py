@@ -0,0 +1,329 @@
+"""Weighted traffic-mix scenario engine"""
+
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+try:
+    import yaml
+except ImportError:  # only needed for YAML --mix-file scenarios
+    yaml = None
+
+from ..config import API_BASE, AGENCY_LIST_FILTERS
+from ..client import AsyncResponse, AsyncClientPool
+from ..stats import LoadResult, print_load_table
+from .load import _fetch_agency_ids
+from .contact import _create_test_agency, _delete_test_agency, _probe_sink
+from .writes import WRITE_REVIEW_COMMENTS
+
+
+# Scenario format, as a Python dict or the equivalent YAML/JSON file:
+#
+#   rate: 10                      # new sessions per second (Poisson arrivals)
+#   think_time: [0.5, 3]          # default pause in seconds between steps
+#   sessions:
+#     - name: browse
+#       weight: 60                # relative share of arriving sessions
+#       steps: [list, detail, {op: detail, think_time: [2, 8]}]
+#
+# Step names are the keys of MIX_OPERATIONS.
+DEFAULT_TRAFFIC_MIX = {
+    'rate': 10,
+    'think_time': [0.5, 3],
+    'sessions': [
+        {'name': 'browse', 'weight': 60, 'steps': ['list', 'detail', 'detail']},
+        {'name': 'search', 'weight': 20, 'steps': ['search', 'detail']},
+        {'name': 'landing', 'weight': 8, 'steps': ['root', 'list']},
+        {'name': 'review', 'weight': 5, 'steps': ['detail', {'op': 'review', 'think_time': [5, 15]}]},
+        {'name': 'enquire', 'weight': 4, 'steps': ['list', 'detail', {'op': 'contact_agency', 'think_time': [5, 15]}]},
+        {'name': 'general enquiry', 'weight': 2, 'steps': ['root', 'contact_general']},
+        {'name': 'register agency', 'weight': 1, 'steps': ['create', 'update']},
+    ],
+}
+
+
+class MixOperation:
+    """How one scenario step maps onto a request the APITester already covers"""
+
+    def __init__(self, method, path, params=None, body=None, expected=(200,), agency=None, yields_ids=False):
+        self.method = method
+        self.path = path              # format string; {id} is the session's agency
+        self.params = params          # rng -> query params
+        self.body = body              # (rng, session) -> JSON body
+        self.expected = expected
+        # None, 'any' (seen or known agency), 'own' (created in this session) or
+        # 'test' (the session's own agency, else the throwaway agency the run creates)
+        self.agency = agency
+        self.yields_ids = yields_ids
+
+
+def _mix_agency_body(rng, session):
+    return {
+        'name': f"Traffic Mix Agency {session['run_id']}-{rng.randrange(10 ** 6)}",
+        'description': "Temporary agency created by backend_test.py --mix",
+        'location': {'city': 'Test City', 'region': 'Test Region', 'postcode': 'TE1 1ST'},
+        'type': 'Private',
+        'contactEmail': 'traffic-mix@testfoster.co.uk',
+        'recruiting': True,
+    }
+
+
+MIX_SEARCH_TERMS = ['London', 'Manchester', 'Birmingham', 'Leeds', 'Glasgow', 'Bristol', 'Kent', 'Surrey']
+
+MIX_OPERATIONS = {
+    'root': MixOperation('GET', '/'),
+    'list': MixOperation('GET', '/agencies', params=lambda rng: dict(rng.choice(AGENCY_LIST_FILTERS)[1]),
+                         yields_ids=True),
+    'search': MixOperation('GET', '/agencies', params=lambda rng: {'search': rng.choice(MIX_SEARCH_TERMS)},
+                           yields_ids=True),
+    'detail': MixOperation('GET', '/agencies/{id}', agency='any'),
+    'create': MixOperation('POST', '/agencies', body=_mix_agency_body, expected=(201,), yields_ids=True),
+    'update': MixOperation('PUT', '/agencies/{id}', agency='own',
+                           body=lambda rng, session: {'description': f"Updated by traffic mix {session['run_id']}"}),
+    # Writes that real agencies would see (reviews, enquiry emails) only ever reach test agencies
+    'review': MixOperation('POST', '/agencies/{id}/reviews', agency='test', expected=(201,),
+                           body=lambda rng, session: {'userId': f"traffic-mix-{session['run_id']}",
+                                                      'userName': "Traffic Mix",
+                                                      'comment': rng.choice(WRITE_REVIEW_COMMENTS),
+                                                      'stars': rng.randint(1, 5)}),
+    # A 500 about email counts as served, as in test_contact_agency/test_general_contact
+    'contact_agency': MixOperation('POST', '/contact/agency', agency='test',
+                                   body=lambda rng, session: {'agencyId': session['agency_id'],
+                                                              'name': "Traffic Mix",
+                                                              'email': 'traffic-mix@example.com',
+                                                              'message': "Traffic mix enquiry, please ignore"}),
+    'contact_general': MixOperation('POST', '/contact/general',
+                                    body=lambda rng, session: {'name': "Traffic Mix",
+                                                               'email': 'traffic-mix@example.com',
+                                                               'message': "Traffic mix enquiry, please ignore"}),
+}
+
+
+def _think_range(value, where):
+    if isinstance(value, (int, float)):
+        value = [value, value]
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, (int, float)) and v >= 0 for v in value) or value[0] > value[1]):
+        raise ValueError(f"{where}: think_time must be seconds or a [min, max] pair")
+    return float(value[0]), float(value[1])
+
+
+def parse_traffic_mix(spec):
+    """Validate a scenario dict and normalise every step to {'op', 'think_time'}"""
+    if not isinstance(spec, dict) or not spec.get('sessions'):
+        raise ValueError("traffic mix needs a non-empty 'sessions' list")
+    rate = float(spec.get('rate', DEFAULT_TRAFFIC_MIX['rate']))
+    if not 0 < rate < math.inf:
+        raise ValueError("traffic mix 'rate' must be a positive, finite number")
+    default_think = _think_range(spec.get('think_time', 0), 'traffic mix')
+    sessions = []
+    for i, session in enumerate(spec['sessions']):
+        name = session.get('name') or f"session {i + 1}"
+        weight = float(session.get('weight', 1))
+        if weight <= 0:
+            raise ValueError(f"session {name!r}: weight must be positive")
+        think = _think_range(session['think_time'], f"session {name!r}") if 'think_time' in session else default_think
+        steps = []
+        created = False
+        for step in session.get('steps') or ():
+            step = {'op': step} if isinstance(step, str) else dict(step)
+            operation = MIX_OPERATIONS.get(step.get('op'))
+            if operation is None:
+                raise ValueError(f"session {name!r}: unknown operation {step.get('op')!r} "
+                                 f"(choose from {', '.join(MIX_OPERATIONS)})")
+            if operation.agency == 'own' and not created:
+                raise ValueError(f"session {name!r}: {step['op']!r} needs an earlier 'create' step")
+            created = created or step['op'] == 'create'
+            steps.append({'op': step['op'],
+                          'think_time': _think_range(step['think_time'], f"session {name!r}")
+                          if 'think_time' in step else think})
+        if not steps:
+            raise ValueError(f"session {name!r} has no steps")
+        sessions.append({'name': name, 'weight': weight, 'steps': steps})
+    return {'rate': rate, 'sessions': sessions}
+
+
+def load_traffic_mix(path):
+    """Read a scenario from a .json file, or YAML when PyYAML is installed"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return parse_traffic_mix(json.load(f))
+        if yaml is None:
+            raise RuntimeError(f"PyYAML is needed to read {path}; install it or use a .json scenario")
+        return parse_traffic_mix(yaml.safe_load(f))
+
+
+def expected_operation_rates(mix):
+    """Requests per second each operation should see at the mix's session rate"""
+    total_weight = sum(session['weight'] for session in mix['sessions'])
+    rates = {}
+    for session in mix['sessions']:
+        for step in session['steps']:
+            rates[step['op']] = rates.get(step['op'], 0.0) + mix['rate'] * session['weight'] / total_weight
+    return rates
+
+
+class MixReport:
+    """Per-operation and per-session results of one traffic-mix run"""
+
+    def __init__(self, mix):
+        self.operations = {op: LoadResult(op, target_rate=rate) for op, rate in expected_operation_rates(mix).items()}
+        total_weight = sum(session['weight'] for session in mix['sessions'])
+        # Session latency is the whole flow, think time included
+        self.sessions = {session['name']: LoadResult(f"session {session['name']}",
+                                                     target_rate=mix['rate'] * session['weight'] / total_weight)
+                         for session in mix['sessions']}
+        self.skipped = 0
+        self.max_start_lag_ms = 0.0
+        self.created = []
+        self.aborted = False
+
+
+def mix_sends_email(mix):
+    """True if any session in `mix` submits a contact form, which sends email"""
+    return any(step['op'].startswith('contact') for session in mix['sessions'] for step in session['steps'])
+
+
+async def _run_mix_session(pool, session, rng, agency_ids, test_agency_id, report, run_id):
+    state = {'run_id': run_id, 'agency_id': None, 'own_id': None}
+    started = time.perf_counter()
+    ok = True
+    for i, step in enumerate(session['steps']):
+        if i:
+            await asyncio.sleep(rng.uniform(*step['think_time']))
+        operation = MIX_OPERATIONS[step['op']]
+        if operation.agency == 'own':
+            state['agency_id'] = state['own_id']
+        elif operation.agency == 'test':
+            state['agency_id'] = state['own_id'] or test_agency_id
+        elif operation.agency == 'any' and state['agency_id'] is None and agency_ids:
+            state['agency_id'] = rng.choice(agency_ids)
+        if operation.agency and state['agency_id'] is None:
+            report.skipped += 1
+            ok = False
+            continue
+        path = operation.path.format(id=state['agency_id'])
+        params = operation.params(rng) if operation.params else None
+        body = operation.body(rng, state) if operation.body else None
+        start = time.perf_counter()
+        try:
+            response = await pool.request(operation.method, path, params=params, json_body=body)
+            served = response.status in operation.expected or (
+                step['op'].startswith('contact') and response.status == 500
+                and 'email' in response.body.decode('utf-8', 'replace').lower())
+        except Exception:
+            response, served = None, False
+        report.operations[step['op']].record((time.perf_counter() - start) * 1000, served,
+                                             len(response.body) if response else 0)
+        ok = ok and served
+        if served and operation.yields_ids and response.status != 500:
+            data = response.json()
+            if 'agency' in data:
+                state['own_id'] = state['agency_id'] = data['agency']['id']
+                report.created.append(state['own_id'])
+            elif data.get('agencies'):
+                state['agency_id'] = rng.choice(data['agencies'])['id']
+    report.sessions[session['name']].record((time.perf_counter() - started) * 1000, ok)
+
+
+async def _run_mix(base_url, mix, duration, max_connections, seed, timeout, sink_url):
+    rng = random.Random(seed)
+    run_id = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    report = MixReport(mix)
+    pool = AsyncClientPool(base_url, max_connections, timeout)
+    test_agency_id = None
+    try:
+        steps = [step['op'] for session in mix['sessions'] for step in session['steps']]
+        if mix_sends_email(mix) or any(MIX_OPERATIONS[op].agency == 'test' for op in steps):
+            # the sink probe is an enquiry too, so it needs the throwaway agency as well
+            test_agency_id = await _create_test_agency(pool, 'mix', 'traffic-mix@testfoster.co.uk')
+            if test_agency_id is None:
+                report.aborted = True
+                return report
+            print(f"🧪 Reviews and enquiries go to throwaway agency {test_agency_id}")
+        if mix_sends_email(mix):
+            # contact_general always mails the site inbox, so no email may leave before the sink is proven
+            if sink_url is None:
+                print("❌ This mix sends contact emails but no email sink is running. Aborting.")
+                report.aborted = True
+                return report
+            tag = uuid.UUID(int=rng.getrandbits(128)).hex[:12]
+            if not await _probe_sink(pool, test_agency_id, sink_url, tag, 'traffic-mix@testfoster.co.uk', timeout):
+                report.aborted = True
+                return report
+        try:
+            agency_ids = await _fetch_agency_ids(pool)
+        except Exception as e:
+            # Same fallback as fetch_agency_ids; the sessions then report the failing requests
+            print(f"❌ Could not list agencies: {e}")
+            agency_ids = []
+        weights = [session['weight'] for session in mix['sessions']]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks = []
+        offset = rng.expovariate(mix['rate'])
+        while offset < duration:
+            delay = started + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            report.max_start_lag_ms = max(report.max_start_lag_ms, (loop.time() - started - offset) * 1000)
+            session = rng.choices(mix['sessions'], weights)[0]
+            tasks.append(asyncio.ensure_future(_run_mix_session(
+                pool, session, random.Random(rng.getrandbits(64)), agency_ids, test_agency_id, report, run_id)))
+            offset += rng.expovariate(mix['rate'])
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - started
+    finally:
+        # Agencies registered by 'create' steps are test data; remove them even after a failure
+        if report.created:
+            deleted = await asyncio.gather(*(pool.request('DELETE', f"/agencies/{agency_id}")
+                                             for agency_id in report.created), return_exceptions=True)
+            removed = sum(1 for response in deleted if isinstance(response, AsyncResponse) and response.status == 200)
+            print(f"🧹 Deleted {removed}/{len(report.created)} agencies created by the mix")
+        if test_agency_id is not None:
+            await _delete_test_agency(pool, 'mix', test_agency_id)
+        await pool.close()
+    # Throughput is over the arrival window; sessions still draining afterwards are included
+    for result in list(report.operations.values()) + list(report.sessions.values()):
+        result.duration = min(duration, elapsed)
+    return report
+
+
+def run_traffic_mix(mix, base_url=API_BASE, duration=60, max_connections=256, seed=None, timeout=15, sink_url=None):
+    """Replay a weighted session mix with Poisson session arrivals at mix['rate'].
+
+    Reviews and agency enquiries go to a throwaway agency (or the session's
+    own), and a mix with contact steps first proves with a probe that email
+    lands in the sink at `sink_url`.
+    """
+    print(f"🔀 Traffic mix against {base_url}: {mix['rate']:g} sessions/s for {duration:g}s")
+    total_weight = sum(session['weight'] for session in mix['sessions'])
+    for session in mix['sessions']:
+        print(f"   {session['weight'] / total_weight:>6.1%}  {session['name']}: "
+              f"{' → '.join(step['op'] for step in session['steps'])}")
+    print("=" * 60)
+    report = asyncio.run(_run_mix(base_url, mix, duration, max_connections, seed, timeout, sink_url))
+    if report.aborted:
+        return report
+
+    print("\n" + "=" * 60)
+    print("📊 TRAFFIC MIX SUMMARY (Load = planned req/s)")
+    print("=" * 60)
+    print_load_table([result for result in report.operations.values() if result.requests])
+    print()
+    print_load_table([result for result in report.sessions.values() if result.requests])
+    total = sum(result.requests for result in report.operations.values())
+    if total:
+        print(f"\n   {'Operation':<18}{'Planned':>9}{'Actual':>9}")
+        planned_total = sum(result.target_rate for result in report.operations.values())
+        for op, result in report.operations.items():
+            print(f"   {op:<18}{result.target_rate / planned_total:>9.1%}{result.requests / total:>9.1%}")
+    if report.skipped:
+        print(f"   ⚠️  {report.skipped} steps skipped for want of an agency ID")
+    if report.max_start_lag_ms > 100:
+        print(f"   ⚠️  Sessions started up to {report.max_start_lag_ms:.0f} ms late; "
+              f"the generator could not keep up with the arrival rate")
+    return report
\ No newline at end of file
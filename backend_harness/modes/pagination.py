@@ -0,0 +1,214 @@
+"""Deep-pagination sweep with streamed page consumption"""
+
+import asyncio
+import codecs
+import csv
+import json
+import math
+import re
+import time
+
+from ..config import API_BASE
+from ..client import AsyncHTTPClient
+from ..stats import LoadResult, linear_fit
+
+
+class JSONArrayStream:
+    """Incrementally decode the items of one top-level array in a JSON body.
+
+    Chunks are fed as they arrive; each complete item is passed to `on_item`
+    and dropped, so only one item is ever buffered. Everything outside the
+    array is kept and returned by close() as the document with an empty array.
+    """
+
+    def __init__(self, key, on_item):
+        self._opening = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._on_item = on_item
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._head = None
+        self._in_array = False
+        self._tail = None
+
+    def feed(self, chunk):
+        text = self._utf8.decode(chunk)
+        if self._tail is not None:
+            self._tail.append(text)
+            return
+        self._buffer += text
+        if self._head is None:
+            match = self._opening.search(self._buffer)
+            if match is None:
+                return
+            self._head = self._buffer[:match.end() - 1]
+            self._buffer = self._buffer[match.end():]
+            self._in_array = True
+        self._drain_items()
+
+    def _drain_items(self):
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == ']':
+                self._in_array = False
+                self._tail = [buffer[pos + 1:]]
+                buffer, pos = '', 0
+                break
+            try:
+                item, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Item split across chunks; wait for more data
+            self._on_item(item)
+        self._buffer = buffer[pos:]
+
+    def close(self):
+        """Return the rest of the document (with the array emptied) as a dict"""
+        self._utf8.decode(b'', final=True)
+        if self._head is None or self._tail is None:
+            raise ValueError("Response ended before the array was complete")
+        return json.loads(self._head + '[]' + ''.join(self._tail))
+
+
+class PaginationSweep:
+    """Latency per page and ID bookkeeping for one full walk at one `limit`"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.pages = []            # (page, offset, rows, latency_ms)
+        self.id_counts = {}
+        self.reported_totals = set()
+        self.short_pages = []
+        self.complete = False      # the walk reached the last page, e.g. not stopped by max_pages
+        self.result = LoadResult(f"GET /agencies paginate limit={limit}")
+
+    @property
+    def duplicates(self):
+        return {agency_id: count for agency_id, count in self.id_counts.items() if count > 1}
+
+    @property
+    def skipped(self):
+        """Rows the reported total says exist but a complete walk never returned"""
+        if not self.complete:
+            return 0
+        return max(0, max(self.reported_totals, default=0) - len(self.id_counts))
+
+
+async def sweep_pagination(client, limit, params=None, max_pages=None):
+    """Walk every page of GET /agencies at `limit`, streaming each page body"""
+    sweep = PaginationSweep(limit)
+    started = time.perf_counter()
+    page, pages = 1, 1
+    while page <= pages and (max_pages is None or page <= max_pages):
+        rows = []
+        nbytes = 0
+
+        def on_chunk(chunk):
+            nonlocal nbytes
+            nbytes += len(chunk)
+            stream.feed(chunk)
+
+        stream = JSONArrayStream('agencies', lambda agency: rows.append(agency.get('id')))
+        start = time.perf_counter()
+        try:
+            response = await client.request('GET', '/agencies', on_chunk=on_chunk,
+                                            params=dict(params or {}, page=str(page), limit=str(limit)))
+            rest = stream.close() if response.status == 200 else None
+        except Exception:
+            rest = None
+        latency_ms = (time.perf_counter() - start) * 1000
+        sweep.result.record(latency_ms, rest is not None, nbytes)
+        if rest is None:
+            break
+
+        pagination = rest.get('pagination', {})
+        pages = pagination.get('pages', 0)
+        sweep.reported_totals.add(pagination.get('total', 0))
+        for agency_id in rows:
+            sweep.id_counts[agency_id] = sweep.id_counts.get(agency_id, 0) + 1
+        if len(rows) < limit and page < pages:
+            sweep.short_pages.append(page)
+        sweep.pages.append((page, (page - 1) * limit, len(rows), latency_ms))
+        sweep.complete = page >= pages
+        page += 1
+    sweep.result.duration = time.perf_counter() - started
+    return sweep
+
+
+def _print_latency_chart(sweep, width=40, rows=20):
+    """ASCII plot of page latency against page number, bucketed to `rows` lines"""
+    if not sweep.pages:
+        return
+    per_row = max(1, math.ceil(len(sweep.pages) / rows))
+    buckets = [sweep.pages[i:i + per_row] for i in range(0, len(sweep.pages), per_row)]
+    averages = [sum(p[3] for p in bucket) / len(bucket) for bucket in buckets]
+    scale = width / max(averages) if max(averages) else 0
+    for bucket, average in zip(buckets, averages):
+        label = f"p{bucket[0][0]}-{bucket[-1][0]}" if len(bucket) > 1 else f"p{bucket[0][0]}"
+        print(f"   {label:>12} {'█' * max(1, round(average * scale)):<{width}} {average:.1f} ms")
+
+
+def run_pagination_sweep(limits, base_url=API_BASE, timeout=10, output=None, max_pages=None):
+    """Walk every page for each limit and report latency growth and ID anomalies"""
+    print(f"📚 Deep-pagination sweep: GET {base_url}/agencies")
+    print(f"   Limits {', '.join(map(str, limits))}")
+    print("=" * 60)
+
+    async def sweep_all():
+        client = AsyncHTTPClient(base_url, timeout)
+        try:
+            return [await sweep_pagination(client, limit, max_pages=max_pages) for limit in limits]
+        finally:
+            await client.close()
+
+    sweeps = asyncio.run(sweep_all())
+    # Only complete walks say which rows exist; one cut short by max_pages saw a prefix
+    all_ids = set().union(*(sweep.id_counts for sweep in sweeps if sweep.complete))
+    consistent = True
+    for sweep in sweeps:
+        print(f"\n📄 limit={sweep.limit}: {len(sweep.pages)} pages, {len(sweep.id_counts)} unique IDs, "
+              f"reported total {', '.join(map(str, sorted(sweep.reported_totals))) or 'n/a'}"
+              f"{'' if sweep.complete else ' (stopped before the last page)'}")
+        if sweep.pages:
+            offsets = [p[1] for p in sweep.pages]
+            latencies = [p[3] for p in sweep.pages]
+            slope, intercept = linear_fit(offsets, latencies)
+            tenth = max(1, len(latencies) // 10)
+            shallow = sorted(latencies[:tenth])[tenth // 2]
+            deep = sorted(latencies[-tenth:])[tenth // 2]
+            print(f"   Latency: first pages {shallow:.1f} ms, last pages {deep:.1f} ms, "
+                  f"trend {slope * 1000:+.2f} ms per 1000 rows of offset")
+            _print_latency_chart(sweep)
+        problems = []
+        if sweep.result.errors:
+            problems.append(f"{sweep.result.errors} page request(s) failed")
+        if len(sweep.reported_totals) > 1:
+            problems.append("total changed during the walk")
+        if sweep.duplicates:
+            problems.append(f"{len(sweep.duplicates)} row(s) returned on more than one page")
+        if sweep.skipped:
+            problems.append(f"{sweep.skipped} row(s) never returned")
+        missing = all_ids - set(sweep.id_counts) if sweep.complete else ()
+        if missing:
+            problems.append(f"{len(missing)} row(s) seen at other limits but not this one")
+        if sweep.short_pages:
+            problems.append(f"short non-final page(s): {sweep.short_pages[:10]}")
+        for problem in problems:
+            print(f"   ❌ {problem}")
+        if not problems:
+            print("   ✅ No duplicated or skipped rows" if sweep.complete else "   ✅ No duplicated rows in the pages walked")
+        consistent = consistent and not problems
+
+    if output:
+        with open(output, 'w', newline='', encoding='utf-8') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['limit', 'page', 'offset', 'rows', 'latency_ms'])
+            for sweep in sweeps:
+                for page, offset, rows, latency_ms in sweep.pages:
+                    writer.writerow([sweep.limit, page, offset, rows, f"{latency_ms:.3f}"])
+        print(f"\n📝 Page latencies written to {output}")
+    return sweeps, consistent
\ No newline at end of file
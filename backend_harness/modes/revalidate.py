@@ -0,0 +1,161 @@
+"""Conditional-request replay measuring 304 revalidation savings"""
+
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from ..config import API_BASE, AGENCY_LIST_FILTERS
+from ..client import AsyncHTTPClient, AsyncClientPool
+from ..stats import LoadResult, print_load_table
+from .load import _fetch_agency_ids
+
+
+class ValidatorCache:
+    """LRU cache of ETag / Last-Modified validators keyed by request target"""
+
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, etag, last_modified, size):
+        self.entries[key] = (etag, last_modified, size)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+
+class RevalidationReport:
+    """Counters and latency split for a conditional-request replay"""
+
+    def __init__(self, concurrency):
+        self.full = LoadResult('GET 200 (full body)', concurrency)
+        self.not_modified = LoadResult('GET 304 (revalidated)', concurrency)
+        self.other = LoadResult('GET other status', concurrency)
+        self.conditional_sent = 0
+        self.with_etag = 0
+        self.with_last_modified = 0
+        self.bytes_saved = 0
+
+    @property
+    def requests(self):
+        return self.full.requests + self.not_modified.requests + self.other.requests
+
+    @property
+    def hit_rate(self):
+        return self.not_modified.successes / self.conditional_sent if self.conditional_sent else 0.0
+
+
+def _revalidation_targets(agency_ids):
+    """Listing filter matrix plus every known detail page, as (path, params)"""
+    targets = [('/agencies', params) for _, params in AGENCY_LIST_FILTERS]
+    targets += [(f"/agencies/{agency_id}", None) for agency_id in agency_ids]
+    return targets
+
+
+async def _revalidate_one(client, cache, report, path, params):
+    key = path + ('?' + urlencode(params) if params else '')
+    cached = cache.get(key)
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        if headers:
+            report.conditional_sent += 1
+    start = time.perf_counter()
+    try:
+        response = await client.request('GET', path, params=params, headers=headers)
+    except Exception:
+        report.other.record((time.perf_counter() - start) * 1000, False)
+        return
+    latency_ms = (time.perf_counter() - start) * 1000
+    if response.status == 304 and cached is not None:
+        report.not_modified.record(latency_ms, True)
+        report.bytes_saved += cached[2]
+    elif response.status == 200:
+        report.full.record(latency_ms, True, len(response.body))
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        report.with_etag += bool(etag)
+        report.with_last_modified += bool(last_modified)
+        if etag or last_modified:
+            cache.put(key, etag, last_modified, len(response.body))
+        else:
+            cache.discard(key)
+    else:
+        report.other.record(latency_ms, response.status < 500, len(response.body))
+
+
+async def _run_revalidation(base_url, total, concurrency, cache_size, seed, timeout):
+    pool = AsyncClientPool(base_url, 1, timeout)
+    try:
+        agency_ids = await _fetch_agency_ids(pool)
+    except Exception as e:
+        # Same fallback as fetch_agency_ids; the replay then reports the failing GETs
+        print(f"❌ Could not list agencies: {e}")
+        agency_ids = []
+    finally:
+        await pool.close()
+    targets = _revalidation_targets(agency_ids)
+    rng = random.Random(seed)
+    sequence = iter([rng.choice(targets) for _ in range(total)])
+    cache = ValidatorCache(cache_size)
+    report = RevalidationReport(concurrency)
+
+    async def worker():
+        client = AsyncHTTPClient(base_url, timeout)
+        try:
+            for path, params in sequence:
+                await _revalidate_one(client, cache, report, path, params)
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    for result in (report.full, report.not_modified, report.other):
+        result.duration = time.perf_counter() - started
+    return report, cache, len(targets)
+
+
+def run_revalidation(base_url=API_BASE, total=500, concurrency=8, cache_size=128, seed=None, timeout=10):
+    """Replay listing and detail GETs with validators and report 304 effectiveness"""
+    print(f"🔁 Conditional-request replay against {base_url}")
+    print(f"   {total} GETs, concurrency {concurrency}, validator cache {cache_size} entries (LRU)")
+    print("=" * 60)
+    report, cache, target_count = asyncio.run(
+        _run_revalidation(base_url, total, concurrency, cache_size, seed, timeout))
+
+    full, not_modified = report.full, report.not_modified
+    print(f"\n📊 REVALIDATION SUMMARY ({target_count} distinct URLs)")
+    print("=" * 60)
+    print_load_table([result for result in (full, not_modified, report.other) if result.requests])
+    print(f"\n   Responses with ETag: {report.with_etag}/{full.successes}, "
+          f"with Last-Modified: {report.with_last_modified}/{full.successes}")
+    print(f"   Conditional requests sent: {report.conditional_sent}; "
+          f"304 hit rate {report.hit_rate:.1%} ({not_modified.successes / report.requests:.1%} of all GETs)"
+          if report.requests else "   No requests completed")
+    transferred = full.bytes_received + report.other.bytes_received
+    print(f"   Body bytes: {transferred / 1024:.1f} KiB received, {report.bytes_saved / 1024:.1f} KiB saved by 304s")
+    print(f"   Validator cache: {len(cache.entries)} entries, {cache.evictions} evictions")
+    if full.successes and not_modified.successes:
+        saved = full.percentiles()[50] - not_modified.percentiles()[50]
+        print(f"   p50 200 vs 304: {full.percentiles()[50]:.1f} ms vs {not_modified.percentiles()[50]:.1f} ms "
+              f"({saved:+.1f} ms saved per revalidated request)")
+    elif not report.with_etag and not report.with_last_modified:
+        print("   ⚠️  No validators returned: every GET transfers the full payload")
+    return report
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""Zipf-distributed search workload built from real place names"""
+
+import asyncio
+import random
+import time
+
+from ..config import API_BASE, LOCATIONS_CSV, read_locations
+from ..client import AsyncHTTPClient
+from ..stats import LoadResult, print_load_table
+from .load import _valid_listing
+
+
+# UK postcode areas. The location CSV has no postcodes, so prefix terms for
+# the postcode column of the search come from this list instead.
+POSTCODE_AREAS = (
+    'AB', 'AL', 'B', 'BA', 'BB', 'BD', 'BH', 'BL', 'BN', 'BR', 'BS', 'BT', 'CA', 'CB', 'CF', 'CH',
+    'CM', 'CO', 'CR', 'CT', 'CV', 'CW', 'DA', 'DD', 'DE', 'DG', 'DH', 'DL', 'DN', 'DT', 'DY', 'E',
+    'EC', 'EH', 'EN', 'EX', 'FK', 'FY', 'G', 'GL', 'GU', 'HA', 'HD', 'HG', 'HP', 'HR', 'HS', 'HU',
+    'HX', 'IG', 'IP', 'IV', 'KA', 'KT', 'KW', 'KY', 'L', 'LA', 'LD', 'LE', 'LL', 'LN', 'LS', 'LU',
+    'M', 'ME', 'MK', 'ML', 'N', 'NE', 'NG', 'NN', 'NP', 'NR', 'NW', 'OL', 'OX', 'PA', 'PE', 'PH',
+    'PL', 'PO', 'PR', 'RG', 'RH', 'RM', 'S', 'SA', 'SE', 'SG', 'SK', 'SL', 'SM', 'SN', 'SO', 'SP',
+    'SR', 'SS', 'ST', 'SW', 'SY', 'TA', 'TD', 'TF', 'TN', 'TQ', 'TR', 'TS', 'TW', 'UB', 'W', 'WA',
+    'WC', 'WD', 'WF', 'WN', 'WR', 'WS', 'WV', 'YO', 'ZE',
+)
+
+SEARCH_TERM_CLASSES = ('city', 'region', 'postcode', 'prefix', 'typo', 'no-match')
+# Consecutive duplicates after which a term class counts as exhausted
+SEARCH_CLASS_MAX_MISSES = 200
+
+
+def _typo(term, rng):
+    """One random edit (drop, swap, or replace a letter) of a place name"""
+    if len(term) < 4:
+        return term + 'x'
+    i = rng.randrange(1, len(term) - 1)
+    edit = rng.choice(('drop', 'swap', 'replace'))
+    if edit == 'drop':
+        return term[:i] + term[i + 1:]
+    if edit == 'swap':
+        return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+    return term[:i] + rng.choice('aeiourstn') + term[i + 1:]
+
+
+def build_search_terms(count=300, seed=None, csv_path=LOCATIONS_CSV):
+    """Distinct (term, class) pairs drawn from the real place names in the CSV"""
+    rng = random.Random(seed)
+    cities, regions = set(), set()
+    for _, region, city, _ in read_locations(csv_path):
+        cities.add(city)
+        regions.add(region)
+    cities, regions = sorted(cities), sorted(regions)
+    generators = {
+        'city': lambda: rng.choice(cities),
+        'region': lambda: rng.choice(regions),
+        'postcode': lambda: rng.choice(POSTCODE_AREAS) + str(rng.randint(1, 20)) * rng.randint(0, 1),
+        'prefix': lambda: (lambda name: name[:rng.randint(3, max(3, min(6, len(name))))])(rng.choice(cities)),
+        'typo': lambda: _typo(rng.choice(cities), rng),
+        'no-match': lambda: ''.join(rng.choice('bcdfghjklmnpqvwxz') for _ in range(rng.randint(5, 8))),
+    }
+    terms = {}
+    # A class that keeps producing duplicates has run out of values and drops out of the rotation
+    active = list(SEARCH_TERM_CLASSES)
+    misses = dict.fromkeys(active, 0)
+    turn = 0
+    while len(terms) < count and active:
+        term_class = active[turn % len(active)]
+        term = generators[term_class]()
+        if term in terms:
+            misses[term_class] += 1
+            if misses[term_class] >= SEARCH_CLASS_MAX_MISSES:
+                active.remove(term_class)
+            continue
+        terms[term] = term_class
+        misses[term_class] = 0
+        turn += 1
+    pairs = list(terms.items())
+    rng.shuffle(pairs)
+    return pairs
+
+
+def zipf_sequence(items, total, exponent=1.1, seed=None):
+    """`total` draws from `items`, where the item at rank r has weight 1 / r**exponent"""
+    rng = random.Random(seed)
+    weights = [1 / rank ** exponent for rank in range(1, len(items) + 1)]
+    return rng.choices(items, weights=weights, k=total)
+
+
+class SearchReport:
+    """Latency and result counts per term class, split by first-seen vs repeated"""
+
+    def __init__(self, concurrency):
+        self.results = {(term_class, phase): LoadResult(f"search {term_class} ({phase})", concurrency)
+                        for term_class in SEARCH_TERM_CLASSES for phase in ('cold', 'warm')}
+        self.zero_results = {term_class: 0 for term_class in SEARCH_TERM_CLASSES}
+        self.matches = {term_class: 0 for term_class in SEARCH_TERM_CLASSES}
+
+
+async def _run_search(base_url, sequence, concurrency, timeout):
+    report = SearchReport(concurrency)
+    seen = set()
+    queries = iter(sequence)
+
+    async def worker():
+        client = AsyncHTTPClient(base_url, timeout)
+        try:
+            for term, term_class in queries:
+                # Classified when dispatched: the first request for a term is cold
+                phase = 'warm' if term in seen else 'cold'
+                seen.add(term)
+                start = time.perf_counter()
+                try:
+                    response = await client.request('GET', '/agencies', params={'search': term})
+                    ok = _valid_listing(response)
+                except Exception:
+                    response, ok = None, False
+                report.results[(term_class, phase)].record(
+                    (time.perf_counter() - start) * 1000, ok, len(response.body) if response else 0)
+                if ok:
+                    total = response.json()['pagination'].get('total', 0)
+                    report.matches[term_class] += total
+                    report.zero_results[term_class] += total == 0
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    for result in report.results.values():
+        result.duration = time.perf_counter() - started
+    return report
+
+
+def run_search_workload(base_url=API_BASE, terms=300, total=1000, concurrency=8, exponent=1.1,
+                        seed=None, timeout=10):
+    """Zipf-distributed search replay over realistic place-name terms"""
+    pairs = build_search_terms(terms, seed)
+    sequence = zipf_sequence(pairs, total, exponent, seed)
+    print(f"🔎 Search workload against {base_url}/agencies?search=")
+    print(f"   {len(pairs)} distinct terms, {total} searches, Zipf s={exponent:g}, concurrency {concurrency}")
+    print(f"   Most popular: {', '.join(repr(term) for term, _ in pairs[:5])}")
+    print("=" * 60)
+    report = asyncio.run(_run_search(base_url, sequence, concurrency, timeout))
+
+    print("\n" + "=" * 60)
+    print("📊 SEARCH SUMMARY")
+    print("=" * 60)
+    print_load_table([result for result in report.results.values() if result.requests])
+    print(f"\n   {'Class':<10}{'Searches':>10}{'Zero-hit':>10}{'Avg hits':>10}{'Cold p50':>11}{'Warm p50':>11}")
+    for term_class in SEARCH_TERM_CLASSES:
+        cold = report.results[(term_class, 'cold')]
+        warm = report.results[(term_class, 'warm')]
+        searches = cold.successes + warm.successes
+        if not searches:
+            continue
+        print(f"   {term_class:<10}{searches:>10}{report.zero_results[term_class] / searches:>10.0%}"
+              f"{report.matches[term_class] / searches:>10.1f}"
+              f"{cold.percentiles()[50]:>9.1f}ms{warm.percentiles()[50]:>9.1f}ms")
+    return report
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""Soak test with rolling-window percentiles and drift detection"""
+
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+from ..stats import PERCENTILES, LatencyHistogram, print_load_table, linear_fit, slope_t
+from ..results import ResultSink
+
+
+SOAK_SNAPSHOT_FILE = 'soak-snapshot.json'
+
+# A drifting slope must sit this many standard errors above zero, so one noisy window cannot trip it
+DRIFT_MIN_T = 3.0
+
+
+class SoakMonitor(ResultSink):
+    """ResultSink that also keeps a histogram per rolling window.
+
+    Closed windows are reduced to a few numbers, so hours of soak still only
+    hold one live histogram plus a small summary per window.
+    """
+
+    def __init__(self, path=None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.started = time.perf_counter()
+        self.windows = []
+        self._open_window()
+
+    def _open_window(self):
+        self.window_started = time.perf_counter()
+        self.window_latency = LatencyHistogram()
+        self.window_total = 0
+        self.window_failed = 0
+
+    def add(self, record):
+        super().add(record)
+        self.window_total += 1
+        self.window_failed += not record.success
+        if record.elapsed_ms is not None:
+            self.window_latency.record(record.elapsed_ms)
+
+    def roll(self):
+        """Close the current window and return its summary"""
+        now = time.perf_counter()
+        latency = self.window_latency
+        summary = {
+            'end_s': round(now - self.started, 3),
+            'duration_s': round(now - self.window_started, 3),
+            'requests': self.window_total,
+            'errors': self.window_failed,
+            'error_rate': self.window_failed / self.window_total if self.window_total else 0.0,
+            'throughput': self.window_total / (now - self.window_started),
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct:g}"] = latency.value_at_percentile(pct) if latency.total_count else None
+        self.windows.append(summary)
+        self._open_window()
+        return summary
+
+
+def soak_trends(windows, threshold=0.2, min_windows=5):
+    """Fit a line to p50, p99 and error rate per window and flag upward drift.
+
+    Latency drifts when the fitted line rises by more than `threshold` of its
+    starting value over the run; the error rate when it rises by more than
+    `threshold` / 10 in absolute terms (2 points at the default 0.2). Either
+    way the slope must also clear DRIFT_MIN_T.
+    """
+    trends = {}
+    if len(windows) < min_windows:
+        return trends
+    xs = [window['end_s'] / 3600 for window in windows]
+    span = xs[-1] - xs[0]
+    for metric in ('p50', 'p99', 'error_rate'):
+        points = [(x, window[metric]) for x, window in zip(xs, windows) if window[metric] is not None]
+        if len(points) < min_windows:
+            continue
+        px, py = [x for x, _ in points], [y for _, y in points]
+        slope, intercept = linear_fit(px, py)
+        t = slope_t(px, py, slope, intercept)
+        start = intercept + slope * xs[0]
+        rise = slope * span
+        if metric == 'error_rate':
+            drifting = rise > threshold / 10
+        else:
+            drifting = rise > threshold * max(start, 1.0)
+        drifting = drifting and t >= DRIFT_MIN_T
+        trends[metric] = {'slope_per_hour': slope, 'start': start, 'rise': rise,
+                          't': t if math.isfinite(t) else None, 'drifting': drifting}
+    return trends
+
+
+def _format_trend(trend, unit):
+    if trend is None:
+        return '—'
+    if unit == '%':
+        return f"{trend['slope_per_hour'] * 100:+.2f}pt/h"
+    return f"{trend['slope_per_hour']:+.1f}{unit}/h"
+
+
+def _write_soak_snapshot(path, tester, monitor, trends, cycles, config):
+    snapshot = {
+        'timestamp': datetime.now().isoformat(),
+        'config': config,
+        'elapsed_s': round(time.perf_counter() - monitor.started, 3),
+        'cycles': cycles,
+        'requests': monitor.total,
+        'failed': monitor.failed,
+        'windows': monitor.windows,
+        'trends': trends,
+        'endpoints': {key: {'requests': stats.requests, 'error_rate': stats.error_rate,
+                            'percentiles_ms': {f"p{pct:g}": value for pct, value in stats.percentiles().items()}}
+                      for key, stats in tester.endpoint_stats.items()},
+    }
+    # Write then rename so a reader never sees a half-written snapshot
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def run_soak(tester, tests, duration=3600, window=60, parallel=False, workers=4,
+             results_file=None, snapshot_file=SOAK_SNAPSHOT_FILE, threshold=0.2):
+    """Repeat `tests` on an APITester for `duration` seconds and watch for drift.
+
+    The tester's result sink is replaced by a SoakMonitor, and every agency a
+    cycle creates is deleted before the next one starts.
+    """
+    base_url = tester.api_base
+    tester.results = monitor = SoakMonitor(results_file)
+    tester.verbose = False
+    # Updates and reviews land on the cycle's own agency, which is deleted again after the cycle
+    tester.write_own_agency = True
+    config = {'base_url': base_url, 'duration_s': duration, 'window_s': window,
+              'parallel': parallel, 'workers': workers, 'threshold': threshold}
+    live = sys.stdout.isatty()
+    print(f"🌊 Soak test against {base_url} for {duration:g}s, {window:g}s windows")
+    print(f"   Snapshots every window to {snapshot_file}")
+    print(f"   Each cycle: {', '.join(name[len('test_'):] for name in tests)}; created agencies are deleted")
+    print("=" * 60)
+    print(f"{'Elapsed':>8} {'Req':>6} {'Req/s':>7} {'Err':>6} {'p50':>8} {'p99':>8}   Trend p50 / p99 / errors")
+
+    trends = {}
+    cycles = 0
+    deleted = 0
+    deadline = monitor.started + duration
+    try:
+        while time.perf_counter() < deadline:
+            tester.reset_agency_ids()
+            try:
+                if parallel:
+                    tester._run_parallel(workers, tests)
+                else:
+                    for name in tests:
+                        tester._run_timed(name)
+            finally:
+                deleted += tester.delete_created_agencies()
+            cycles += 1
+            now = time.perf_counter()
+            if now - monitor.window_started >= window or now >= deadline:
+                summary = monitor.roll()
+                trends = soak_trends(monitor.windows, threshold)
+                flags = ' '.join(f"⚠️ {metric}" for metric, trend in trends.items() if trend['drifting'])
+                p50, p99 = summary['p50'], summary['p99']
+                print(f"{'':<100}\r" if live else '', end='')
+                print(f"{summary['end_s']:>7.0f}s {summary['requests']:>6} {summary['throughput']:>7.1f} "
+                      f"{summary['error_rate']:>6.1%} {p50 or 0:>6.1f}ms {p99 or 0:>6.1f}ms   "
+                      f"{_format_trend(trends.get('p50'), 'ms')} / {_format_trend(trends.get('p99'), 'ms')} / "
+                      f"{_format_trend(trends.get('error_rate'), '%')} {flags}")
+                monitor.flush()
+                _write_soak_snapshot(snapshot_file, tester, monitor, trends, cycles, config)
+            elif live:
+                print(f"   … {now - monitor.started:.0f}s, cycle {cycles}, {monitor.window_total} requests "
+                      f"in window, {monitor.window_failed} failed", end='\r', flush=True)
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted, writing final snapshot")
+        if monitor.window_total:
+            monitor.roll()
+        trends = soak_trends(monitor.windows, threshold)
+        _write_soak_snapshot(snapshot_file, tester, monitor, trends, cycles, config)
+    finally:
+        monitor.close()
+
+    print("\n" + "=" * 60)
+    print("📊 SOAK SUMMARY")
+    print("=" * 60)
+    print(f"   {cycles} cycles, {monitor.total} requests, {monitor.failed} failed, {len(monitor.windows)} windows")
+    print(f"   🧹 Deleted {deleted} test agencies")
+    for stats in tester.endpoint_stats.values():
+        stats.duration = time.perf_counter() - monitor.started
+    print_load_table(list(tester.endpoint_stats.values()))
+    drifting = [metric for metric, trend in trends.items() if trend['drifting']]
+    if not trends:
+        print("\n   Too few windows to fit a trend; run longer or shorten --soak-window")
+    for metric, trend in trends.items():
+        unit = '%' if metric == 'error_rate' else 'ms'
+        print(f"   {'⚠️ ' if trend['drifting'] else '✅'} {metric}: {_format_trend(trend, unit)}"
+              f" ({'drifting upward' if trend['drifting'] else 'stable'})")
+    return monitor, drifting
\ No newline at end of file
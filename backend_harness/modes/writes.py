@@ -0,0 +1,161 @@
+"""Concurrent write-path load with a rating consistency check"""
+
+import asyncio
+import random
+import time
+import uuid
+
+from ..config import API_BASE
+from ..client import AsyncClientPool
+from ..stats import LoadResult, print_load_table
+
+
+WRITE_REVIEW_COMMENTS = (
+    "Supportive team and thorough training.",
+    "Communication could be better but the carers' support is good.",
+    "Matched us quickly with a placement that suited our family.",
+)
+
+
+async def _timed_write(pool, result, method, path, json_body, expected_status):
+    start = time.perf_counter()
+    try:
+        response = await pool.request(method, path, json_body=json_body)
+    except Exception:
+        response = None
+    ok = response is not None and response.status == expected_status
+    result.record((time.perf_counter() - start) * 1000, ok, len(response.body) if response else 0)
+    return response if ok else None
+
+
+async def _read_agency(pool, agency_id, description):
+    """Current row for an agency, even if it is not verified and hidden from GET"""
+    response = await pool.request('GET', f"/agencies/{agency_id}")
+    if response.status == 200:
+        return response.json()['agency']
+    # Unverified agencies 404 on GET; a no-op PUT echoes the stored row instead
+    response = await pool.request('PUT', f"/agencies/{agency_id}", json_body={'description': description})
+    return response.json().get('agency') if response.status == 200 else None
+
+
+async def _run_write_load(base_url, agencies, requests_total, concurrency, update_ratio, seed, timeout):
+    pool = AsyncClientPool(base_url, concurrency, timeout)
+    rng = random.Random(seed)
+    run_id = uuid.uuid4().hex[:8]
+    creates = LoadResult('POST /agencies', concurrency)
+    reviews = LoadResult('POST /agencies/:id/reviews', concurrency)
+    updates = LoadResult('PUT /agencies/:id', concurrency)
+    deletes = LoadResult('DELETE /agencies/:id', concurrency)
+    submitted = {}
+    descriptions = {}
+    try:
+        started = time.perf_counter()
+        created = await asyncio.gather(*(_timed_write(pool, creates, 'POST', '/agencies', {
+            'name': f"Write Load Test Agency {run_id} #{i + 1}",
+            'description': "Temporary agency created by backend_test.py --write-load",
+            'location': {'city': 'Test City', 'region': 'Test Region', 'postcode': 'TE1 1ST'},
+            'type': 'Private',
+            'contactEmail': 'write-load@testfoster.co.uk',
+            'recruiting': True,
+        }, 201) for i in range(agencies)))
+        creates.duration = time.perf_counter() - started
+        agency_ids = [response.json()['agency']['id'] for response in created if response is not None]
+        if not agency_ids:
+            print("❌ Could not create any test agencies")
+            return [creates], False
+
+        for agency_id in agency_ids:
+            submitted[agency_id] = []
+
+        # Plan every write up front so concurrency only changes timing, not content
+        plan = []
+        for i in range(requests_total):
+            agency_id = rng.choice(agency_ids)
+            if rng.random() < update_ratio:
+                descriptions[agency_id] = f"Updated by write load {run_id} step {i}"
+                plan.append(('PUT', agency_id, {'description': descriptions[agency_id], 'recruiting': i % 2 == 0}))
+            else:
+                plan.append(('POST', agency_id, {
+                    'userId': f"write-load-{run_id}-{i}",
+                    'userName': f"Load Tester {i}",
+                    'comment': rng.choice(WRITE_REVIEW_COMMENTS),
+                    'stars': rng.randint(1, 5),
+                }))
+
+        steps = iter(plan)
+
+        async def writer():
+            # Each writer keeps one request in flight, so latency excludes pool queueing
+            for method, agency_id, body in steps:
+                if method == 'PUT':
+                    await _timed_write(pool, updates, 'PUT', f"/agencies/{agency_id}", body, 200)
+                else:
+                    response = await _timed_write(pool, reviews, 'POST', f"/agencies/{agency_id}/reviews", body, 201)
+                    if response is not None:
+                        approved = bool(response.json().get('review', {}).get('approved'))
+                        submitted[agency_id].append((body['stars'], approved))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(concurrency)))
+        reviews.duration = updates.duration = time.perf_counter() - started
+
+        # update_agency_rating averages approved reviews only, and new reviews start unapproved
+        consistent = True
+        checked = 0
+        print("\n🔍 Rating consistency (final rating vs mean of approved stars):")
+        for agency_id in agency_ids:
+            stars = [value for value, approved in submitted[agency_id] if approved]
+            checked += bool(stars)
+            pending = len(submitted[agency_id]) - len(stars)
+            agency = await _read_agency(pool, agency_id, descriptions.get(agency_id, ''))
+            if agency is None:
+                print(f"   ❌ {agency_id}: could not read back the agency")
+                consistent = False
+                continue
+            expected = sum(stars) / len(stars) if stars else None
+            rating = agency.get('rating')
+            count = agency.get('review_count')
+            ok = expected is None or (rating is not None and abs(float(rating) - expected) <= 0.01)
+            if count is not None and count != len(stars):
+                ok = False
+            status = "❌" if not ok else "✅" if stars else "➖"
+            expected_text = f"{expected:.2f}" if expected is not None else "n/a"
+            print(f"   {status} {agency_id}: rating {rating}, expected {expected_text} "
+                  f"from {len(stars)} approved reviews (review_count {count}, {pending} pending approval)")
+            consistent = consistent and ok
+        if not consistent:
+            print("   ⚠️  rating/review_count disagree with the approved reviews: the rating trigger "
+                  "missed or double-counted rows")
+        elif not checked:
+            print("   ⚠️  No review was approved, so the rating recompute was never exercised: inconclusive")
+            consistent = None
+    finally:
+        # Bulk-delete everything this run created, even after a failure
+        started = time.perf_counter()
+        await asyncio.gather(*(_timed_write(pool, deletes, 'DELETE', f"/agencies/{agency_id}", None, 200)
+                               for agency_id in submitted))
+        deletes.duration = time.perf_counter() - started
+        print(f"\n🧹 Deleted {deletes.successes}/{len(submitted)} test agencies")
+        await pool.close()
+    return [creates, reviews, updates, deletes], consistent
+
+
+def run_write_load(base_url=API_BASE, agencies=3, requests_total=200, concurrency=16,
+                   update_ratio=0.2, seed=None, timeout=15):
+    """Concurrent reviews and updates against a few throwaway agencies.
+
+    Returns the per-request results and whether the final ratings match the
+    approved reviews, or None when no review was approved and there was
+    nothing to check.
+    """
+    print(f"✍️  Write-path load test against {base_url}")
+    print(f"   {agencies} agencies, {requests_total} writes ({update_ratio:.0%} updates), "
+          f"concurrency {concurrency}")
+    print("=" * 60)
+    results, consistent = asyncio.run(_run_write_load(base_url, agencies, requests_total, concurrency,
+                                                      update_ratio, seed, timeout))
+    print("\n" + "=" * 60)
+    print("📊 WRITE LOAD SUMMARY")
+    print("=" * 60)
+    print_load_table(results)
+    return results, consistent
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Functional test records and the bounded sink that aggregates them"""
+
+import json
+import time
+from datetime import datetime
+
+from .stats import LatencyHistogram
+
+
+# Order in which per-request phases are reported
+REQUEST_PHASES = ('dns', 'connect', 'tls', 'ttfb', 'download', 'decode')
+
+
+class TestRecord:
+    """One logged test result; slotted so long runs stay small in memory"""
+    __slots__ = ('test', 'success', 'details', 'response_code', 'elapsed_ms', 'timestamp',
+                 'phases', 'server_timing')
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, test, success, details, response_code=None, elapsed_ms=None, timestamp=None,
+                 phases=None, server_timing=None):
+        self.test = test
+        self.success = success
+        self.details = details
+        self.response_code = response_code
+        self.elapsed_ms = elapsed_ms
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.phases = phases
+        self.server_timing = server_timing
+
+    def to_dict(self):
+        return {
+            'test': self.test,
+            'success': self.success,
+            'details': self.details,
+            'response_code': self.response_code,
+            'elapsed_ms': self.elapsed_ms,
+            'phases_ms': self.phases,
+            'server_timing_ms': self.server_timing,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+
+class PhaseBreakdown:
+    """Per-endpoint histograms of request phases and Server-Timing metrics"""
+
+    def __init__(self):
+        self.phases = {}
+        self.server_timing = {}
+
+    @staticmethod
+    def _record(histograms, name, value):
+        if value is None:
+            return
+        histogram = histograms.get(name)
+        if histogram is None:
+            # Two significant figures keep each histogram around 20 KB
+            histogram = histograms[name] = LatencyHistogram(significant_figures=2)
+        histogram.record(value)
+
+    def record(self, phases, server_timing):
+        for name, value in phases.items():
+            self._record(self.phases, name, value)
+        for name, value in (server_timing or {}).items():
+            self._record(self.server_timing, name, value)
+
+
+class ResultSink:
+    """Streams TestRecords to an NDJSON file and keeps only running aggregates.
+
+    Memory stays bounded however long the run: pass/fail counts, a latency
+    histogram and the first `max_failures` failures are all that is retained.
+    Callers are expected to serialise calls to add().
+    """
+
+    def __init__(self, path=None, max_failures=50, flush_every=100):
+        self.path = path
+        self.max_failures = max_failures
+        self.flush_every = flush_every
+        self.total = 0
+        self.passed = 0
+        self.failures = []
+        self.latency = LatencyHistogram()
+        self.latency_sum_ms = 0.0
+        self._unflushed = 0
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def failed(self):
+        return self.total - self.passed
+
+    def add(self, record):
+        self.total += 1
+        if record.success:
+            self.passed += 1
+        elif len(self.failures) < self.max_failures:
+            self.failures.append(record)
+        if record.elapsed_ms is not None:
+            self.latency.record(record.elapsed_ms)
+            self.latency_sum_ms += record.elapsed_ms
+        if self._file is not None:
+            self._file.write(json.dumps(record.to_dict()) + "\n")
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self.flush()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+            self._unflushed = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
\ No newline at end of file
@@ -0,0 +1,524 @@
+"""Local stand-in for the /api routes and a Resend-compatible email sink"""
+
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import random
+import re
+import time
+import uuid
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import parse_qsl, urlsplit
+
+from .config import LOCATIONS_CSV, read_locations
+from .client import AsyncClientPool
+
+
+AGENCY_TYPES = ('Private', 'Charity', 'Local Authority')
+
+HTTP_REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request',
+                404: 'Not Found', 500: 'Internal Server Error'}
+
+CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
+)
+
+
+def _synthetic_postcode(city, seed):
+    letters = ''.join(ch for ch in city.upper() if ch.isalpha())[:2].ljust(2, 'X')
+    return f"{letters}{seed % 20 + 1} {seed % 9 + 1}{chr(65 + seed % 26)}{chr(65 + seed * 7 % 26)}"
+
+
+class AgencyStore:
+    """In-memory agency table with the indexes the catch-all route relies on.
+
+    Agencies are kept by id, with secondary indexes on type and featured and
+    a cached (featured desc, rating desc) ordering that is rebuilt lazily
+    after writes. Search scans a precomputed lower-cased haystack, which is
+    the in-memory equivalent of the route's ilike OR query.
+    """
+
+    def __init__(self):
+        self.agencies = {}
+        self.reviews = {}
+        self.inquiries = 0
+        self._by_type = {}
+        self._featured = set()
+        self._haystack = {}
+        self._ordered = None
+        # Time of the last write to any agency, served as Last-Modified
+        self.modified_at = time.time()
+
+    @classmethod
+    def seeded(cls, path=LOCATIONS_CSV):
+        store = cls()
+        for seed, (country, region, city, url) in enumerate(read_locations(path)):
+            store.insert({
+                'name': f"{city} Foster Care",
+                'description': f"Fostering services for children and carers in {city}, {region}.",
+                'city': city,
+                'region': region,
+                'country': country,
+                'postcode': _synthetic_postcode(city, seed),
+                'address': f"{seed + 1} High Street, {city}",
+                'type': AGENCY_TYPES[seed % len(AGENCY_TYPES)],
+                'rating': round(3.5 + (seed * 37 % 16) / 10, 1),
+                'review_count': seed * 13 % 50,
+                'contact_email': f"info@{url.rsplit('/', 1)[-1]}-fostering.co.uk",
+                'featured': seed % 7 == 0,
+                'recruiting': seed % 3 != 0,
+                'verified': True,
+            })
+        return store
+
+    def _index(self, agency):
+        self._by_type.setdefault(agency.get('type'), set()).add(agency['id'])
+        if agency.get('featured'):
+            self._featured.add(agency['id'])
+        location = agency.get('location') or {}
+        fields = [agency.get(name) or location.get(name) for name in ('city', 'region', 'postcode')]
+        self._haystack[agency['id']] = ' '.join(str(f) for f in [agency.get('name')] + fields if f).lower()
+        self._ordered = None
+        self.modified_at = time.time()
+
+    def _unindex(self, agency):
+        self._by_type.get(agency.get('type'), set()).discard(agency['id'])
+        self._featured.discard(agency['id'])
+        self._haystack.pop(agency['id'], None)
+        self._ordered = None
+        self.modified_at = time.time()
+
+    def insert(self, data):
+        agency = dict(data)
+        agency['id'] = str(uuid.uuid4())
+        agency.setdefault('rating', 0)
+        agency.setdefault('review_count', 0)
+        agency.setdefault('featured', False)
+        agency.setdefault('verified', False)
+        agency['created_at'] = datetime.now().isoformat()
+        location = agency.get('location')
+        if isinstance(location, dict):
+            for name in ('city', 'region', 'postcode', 'address'):
+                agency.setdefault(name, location.get(name))
+        agency['location'] = {name: agency.get(name) for name in ('city', 'region', 'postcode', 'address')}
+        self.agencies[agency['id']] = agency
+        self._index(agency)
+        return agency
+
+    def update(self, agency_id, data):
+        agency = self.agencies.get(agency_id)
+        if agency is None:
+            return None
+        self._unindex(agency)
+        agency.update({key: value for key, value in data.items() if key != 'id'})
+        self._index(agency)
+        return agency
+
+    def delete(self, agency_id):
+        agency = self.agencies.pop(agency_id, None)
+        if agency is not None:
+            self._unindex(agency)
+            self.reviews.pop(agency_id, None)
+        return agency
+
+    def ordered_ids(self):
+        if self._ordered is None:
+            self._ordered = sorted(self.agencies, key=lambda agency_id: (
+                not self.agencies[agency_id].get('featured'), -(self.agencies[agency_id].get('rating') or 0)))
+        return self._ordered
+
+    def query(self, search=None, agency_type=None, featured=False, user_id=None):
+        """Verified agencies matching the listing filters, in listing order"""
+        candidates = None
+        if agency_type:
+            candidates = self._by_type.get(agency_type, set())
+        if featured:
+            candidates = self._featured if candidates is None else candidates & self._featured
+        needle = search.lower() if search else None
+        matches = []
+        for agency_id in self.ordered_ids():
+            if candidates is not None and agency_id not in candidates:
+                continue
+            agency = self.agencies[agency_id]
+            if not agency.get('verified'):
+                continue
+            if user_id and agency.get('user_id') != user_id:
+                continue
+            if needle and needle not in self._haystack[agency_id]:
+                continue
+            matches.append(agency)
+        return matches
+
+    def add_review(self, agency_id, body, approved=False):
+        """Store a review and recompute the rating like update_agency_rating.
+
+        The trigger averages approved reviews only, so with none approved the
+        rating becomes NULL and review_count 0. Real reviews start unapproved;
+        `approved` stands in for a moderator approving one straight away.
+        """
+        agency = self.agencies.get(agency_id)
+        if agency is None:
+            return None, None
+        review = {
+            'id': str(uuid.uuid4()),
+            'agency_id': agency_id,
+            'user_id': body.get('userId'),
+            'user_name': body.get('userName'),
+            'comment': body.get('comment'),
+            'stars': body.get('stars'),
+            'approved': approved,
+            'created_at': datetime.now().isoformat(),
+        }
+        reviews = self.reviews.setdefault(agency_id, [])
+        reviews.append(review)
+        approved = [r for r in reviews if r['approved']]
+        stars = [r['stars'] for r in approved if isinstance(r['stars'], (int, float))]
+        self.update(agency_id, {
+            'rating': round(sum(stars) / len(stars), 2) if stars else None,
+            'review_count': len(approved),
+        })
+        return review, agency
+
+
+class AsyncHTTPServer:
+    """Keep-alive HTTP/1.1 server on asyncio streams; subclasses override dispatch()
+
+    dispatch(method, target, body) returns (status, payload) or
+    (status, payload, extra_headers); a bytes payload is served as HTML and
+    anything else as JSON. The base server has no routes and answers 404.
+    """
+
+    async def dispatch(self, method, target, body):
+        return 404, {'error': f"Route {urlsplit(target).path} not found"}
+
+    async def respond(self, method, target, headers, body):
+        status, payload, *extra = await self.dispatch(method, target, body)
+        return status, payload, tuple(extra[0]) if extra else ()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length') or 0)
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload, extra_headers = await self.respond(method, target, headers, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(self._encode(status, payload, extra_headers, keep_alive=keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode(status, payload, extra_headers=(), keep_alive=True):
+        if isinstance(payload, bytes):
+            body, content_type = payload, 'text/html; charset=utf-8'
+        else:
+            body = json.dumps(payload).encode() if payload is not None else b''
+            content_type = 'application/json'
+        head = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in CORS_HEADERS]
+        head += [f"{name}: {value}" for name, value in extra_headers]
+        # One write per response avoids Nagle/delayed-ACK stalls on keep-alive
+        return ("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + body
+
+    async def serve(self, host='127.0.0.1', port=0, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        bound_port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.send(bound_port)
+        async with server:
+            await server.serve_forever()
+
+
+class StandInServer(AsyncHTTPServer):
+    """asyncio HTTP/1.1 server implementing the /api contract backend_test.py asserts on"""
+
+    def __init__(self, store=None, latency_ms=0.0, jitter_ms=0.0, failure_rate=0.0,
+                 email_failure_rate=0.0, etags=False, last_modified=False, email_api=None,
+                 review_approval_rate=0.0, seed=None):
+        self.store = store if store is not None else AgencyStore.seeded()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.email_failure_rate = email_failure_rate
+        self.etags = etags
+        self.last_modified = last_modified
+        self.email_api = email_api
+        # Test hook: fraction of new reviews approved on arrival, so the rating recompute has input
+        self.review_approval_rate = review_approval_rate
+        self.email_pool = None
+        self.random = random.Random(seed)
+        self.page_cache = {}
+
+    async def respond(self, method, target, headers, body):
+        started = time.perf_counter()
+        status, payload, extra_headers = await super().respond(method, target, headers, body)
+        if (self.etags or self.last_modified) and method == 'GET' and status == 200 and not extra_headers:
+            status, payload, extra_headers = self._conditional(payload, headers)
+        # Mirrors the Server-Timing header the real routes can emit
+        timing = (('Server-Timing', f'app;dur={(time.perf_counter() - started) * 1000:.3f};'
+                                    f'desc="Stand-in handler"'),)
+        return status, payload, tuple(extra_headers) + timing
+
+    async def dispatch(self, method, target, body):
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep((self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000)
+        if method == 'OPTIONS':
+            return 200, None
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            return 500, {'error': 'Internal server error', 'details': 'Injected failure'}
+        parts = urlsplit(target)
+        if parts.path.startswith('/foster-agency/') and method == 'GET':
+            return self.render_location_page(parts.path)
+        if not parts.path.startswith('/api'):
+            return 404, {'error': f"Route {parts.path} not found"}
+        route = parts.path[len('/api'):].rstrip('/') or '/'
+        path = [segment for segment in route.split('/') if segment]
+        params = dict(parse_qsl(parts.query))
+        try:
+            data = json.loads(body) if body else {}
+            return await self.route(method, route, path, params, data)
+        except Exception as e:
+            return 500, {'error': 'Internal server error', 'details': str(e)}
+
+    async def route(self, method, route, path, params, body):
+        store = self.store
+
+        if route in ('/', '/root') and method == 'GET':
+            return 200, {'message': 'Foster Care Directory UK API', 'version': '1.0.0', 'status': 'running'}
+
+        if route == '/agencies' and method == 'GET':
+            limit = int(params.get('limit') or 50)
+            page = int(params.get('page') or 1)
+            offset = (page - 1) * limit
+            matches = store.query(params.get('search'), params.get('type'),
+                                  params.get('featured') == 'true', params.get('userId'))
+            return 200, {
+                'agencies': matches[offset:offset + limit],
+                'pagination': {'page': page, 'limit': limit, 'total': len(matches),
+                               'pages': math.ceil(len(matches) / limit)},
+            }
+
+        if route == '/agencies' and method == 'POST':
+            return 201, {'success': True, 'agency': store.insert(body)}
+
+        if len(path) == 3 and path[0] == 'agencies' and path[2] == 'reviews' and method == 'POST':
+            approved = bool(self.review_approval_rate) and self.random.random() < self.review_approval_rate
+            review, agency = store.add_review(path[1], body, approved)
+            if review is None:
+                return 404, {'error': 'Agency not found'}
+            return 201, {
+                'success': True,
+                'review': review,
+                'agency': {'id': agency['id'], 'rating': agency['rating'],
+                           'review_count': agency['review_count']},
+                'message': 'Review submitted for approval',
+            }
+
+        if len(path) == 2 and path[0] == 'agencies':
+            agency_id = path[1]
+            if method == 'GET':
+                agency = store.agencies.get(agency_id)
+                if agency is None or not agency.get('verified'):
+                    return 404, {'error': 'Agency not found'}
+                reviews = [r for r in store.reviews.get(agency_id, []) if r['approved']]
+                return 200, {'agency': dict(agency, services=agency.get('services', []), reviews=reviews)}
+            if method == 'PUT':
+                agency = store.update(agency_id, body)
+                if agency is None:
+                    return 404, {'error': 'Agency not found'}
+                return 200, {'success': True, 'agency': agency}
+            if method == 'DELETE':
+                if store.delete(agency_id) is None:
+                    return 404, {'error': 'Agency not found'}
+                return 200, {'success': True, 'message': 'Agency deleted successfully'}
+
+        if route == '/contact/agency' and method == 'POST':
+            if not all(body.get(field) for field in ('agencyId', 'name', 'email', 'message')):
+                return 400, {'error': 'All fields are required'}
+            agency = store.agencies.get(body['agencyId'])
+            if agency is None:
+                return 404, {'error': 'Agency not found'}
+            return await self._deliver_inquiry('Your inquiry has been sent successfully', {
+                'to': agency.get('contact_email'),
+                'subject': f"New Inquiry from {body['name']} - Foster Care Directory UK",
+                'html': f"<h2>New Inquiry for {agency['name']}</h2><p>{body['message']}</p>",
+            })
+
+        if route == '/contact/general' and method == 'POST':
+            if not all(body.get(field) for field in ('name', 'email', 'message')):
+                return 400, {'error': 'All fields are required'}
+            return await self._deliver_inquiry('Your message has been sent successfully', {
+                'to': 'info@foster-care.co.uk',
+                'reply_to': body['email'],
+                'subject': f"General Inquiry from {body['name']}",
+                'html': f"<h2>General Inquiry</h2><p>{body['message']}</p>",
+            })
+
+        return 404, {'error': f"Route {route} not found"}
+
+    def _conditional(self, payload, headers):
+        """Validators for a GET, and a 304 with no body when the client's copy is current.
+
+        The ETag is a weak hash of the JSON body; Last-Modified is the time
+        of the last write to the store. As in RFC 9110, If-Modified-Since is
+        only evaluated when the request carries no If-None-Match.
+        """
+        validators = ()
+        etag = None
+        if self.etags:
+            etag = 'W/"%s"' % hashlib.sha1(json.dumps(payload).encode()).hexdigest()[:20]
+            validators += (('ETag', etag),)
+        if self.last_modified:
+            validators += (('Last-Modified', formatdate(int(self.store.modified_at), usegmt=True)),)
+        if_none_match = headers.get('if-none-match')
+        if_modified_since = headers.get('if-modified-since')
+        fresh = False
+        if if_none_match:
+            fresh = etag is not None and etag in [tag.strip() for tag in if_none_match.split(',')]
+        elif if_modified_since and self.last_modified:
+            try:
+                fresh = int(self.store.modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                fresh = False
+        if fresh:
+            return 304, None, validators
+        return 200, payload, validators + (('Cache-Control', 'no-cache'),)
+
+    def render_location_page(self, path):
+        """Minimal location landing page with CDN-style cache headers.
+
+        The first request for a path is reported as a cache MISS and later
+        ones as HITs, so crawler cold/warm passes can be exercised offline.
+        """
+        rendered_at = self.page_cache.get(path)
+        if rendered_at is None:
+            self.page_cache[path] = time.time()
+            cache_headers = (('x-vercel-cache', 'MISS'), ('Age', '0'))
+        else:
+            cache_headers = (('x-vercel-cache', 'HIT'), ('Age', str(int(time.time() - rendered_at))))
+        title = path.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').title()
+        body = f"<!doctype html><title>Foster agencies in {title}</title><h1>{title}</h1>".encode()
+        headers = (('Cache-Control', 'public, max-age=0, s-maxage=3600, stale-while-revalidate'),) + cache_headers
+        return 200, body, headers
+
+    async def _deliver_inquiry(self, message, email):
+        """Send the email inline, like sendContactEmail/sendGeneralInquiry in the route"""
+        self.store.inquiries += 1
+        if self.email_api:
+            if self.email_pool is None:
+                self.email_pool = AsyncClientPool(self.email_api, 256, timeout=15)
+            try:
+                response = await self.email_pool.request(
+                    'POST', '/emails', json_body=dict(email, **{'from': 'onboarding@resend.dev'}),
+                    headers={'Authorization': 'Bearer re_stand_in'})
+            except Exception as e:
+                return 500, {'error': 'Failed to send email', 'details': str(e)}
+            if response.status != 200:
+                return 500, {'error': 'Failed to send email', 'details': response.json().get('message')}
+        elif self.email_failure_rate and self.random.random() < self.email_failure_rate:
+            return 500, {'error': 'Failed to send email', 'details': 'Injected email failure'}
+        return 200, {'success': True, 'message': message}
+
+def _serve_stand_in(host, port, options, ready):
+    try:
+        asyncio.run(StandInServer(**options).serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_stand_in(host='127.0.0.1', port=3001, **options):
+    """Run the stand-in API server in the foreground until interrupted"""
+    _serve_stand_in(host, port, options, None)
+
+
+def _start_server_process(target, host, port, options):
+    # Platform-default start method, so the stand-in also starts on Windows (spawn)
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=target, args=(host, port, options, sender), daemon=True)
+    process.start()
+    if not receiver.poll(30):
+        process.terminate()
+        raise RuntimeError("Stand-in server did not start")
+    return process, receiver.recv()
+
+
+def start_stand_in(host='127.0.0.1', port=0, **options):
+    """Start the stand-in server in its own process; returns (process, api_base)"""
+    process, port = _start_server_process(_serve_stand_in, host, port, options)
+    return process, f"http://{host}:{port}/api"
+
+
+# Tag embedded in each load-test message so the email sink can attribute time per request
+EMAIL_TAG = re.compile(r'\[lt-([0-9a-f]{12})\]')
+
+
+class EmailSink(AsyncHTTPServer):
+    """Resend-compatible POST /emails endpoint with injected delay and failures.
+
+    Each delivery's handling time is logged under the `[lt-…]` tag found in
+    the email body and served back from GET /_sink/log.
+    """
+
+    def __init__(self, delay_ms=0.0, jitter_ms=0.0, failure_rate=0.0, seed=None):
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.log = {}
+        self.untagged = 0
+
+    async def dispatch(self, method, target, body):
+        path = urlsplit(target).path
+        if method == 'GET' and path == '/_sink/log':
+            return 200, self.log
+        if method != 'POST' or path != '/emails':
+            return 404, {'statusCode': 404, 'name': 'not_found', 'message': 'The requested endpoint does not exist.'}
+        started = time.perf_counter()
+        await asyncio.sleep((self.delay_ms + self.random.uniform(0, self.jitter_ms)) / 1000)
+        failed = self.failure_rate and self.random.random() < self.failure_rate
+        match = EMAIL_TAG.search(json.loads(body or b'{}').get('html', ''))
+        if match:
+            self.log[match.group(1)] = {'ms': (time.perf_counter() - started) * 1000, 'ok': not failed}
+        else:
+            self.untagged += 1
+        if failed:
+            return 500, {'statusCode': 500, 'name': 'application_error', 'message': 'Injected provider failure'}
+        return 200, {'id': str(uuid.uuid4())}
+
+
+def _serve_email_sink(host, port, options, ready):
+    try:
+        asyncio.run(EmailSink(**options).serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def start_email_sink(host='127.0.0.1', port=0, **options):
+    """Start the email sink in its own process; returns (process, base_url)"""
+    process, port = _start_server_process(_serve_email_sink, host, port, options)
+    return process, f"http://{host}:{port}"
\ No newline at end of file
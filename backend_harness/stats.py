@@ -0,0 +1,225 @@
+"""Latency histograms, per-scenario results and the statistics used to compare them"""
+
+import math
+from array import array
+
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Fixed-memory, mergeable log-linear latency histogram (HdrHistogram layout).
+
+    Values are recorded in microseconds. Every value up to `highest_us` is kept
+    to `significant_figures` decimal digits of precision, so memory does not
+    grow with the number of samples and merging two histograms is exact.
+    """
+
+    def __init__(self, highest_us=60_000_000, significant_figures=3):
+        self.highest_us = highest_us
+        self.significant_figures = significant_figures
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._half_magnitude = math.ceil(math.log2(largest_single_unit)) - 1
+        self._sub_bucket_count = 1 << (self._half_magnitude + 1)
+        self._half_count = self._sub_bucket_count // 2
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count
+        while smallest_untrackable <= highest_us:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.counts = array('Q', bytes(8 * (bucket_count + 1) * self._half_count))
+        self.total_count = 0
+        self.max_us = 0
+
+    def _index(self, value):
+        bucket = max(0, value.bit_length() - (self._half_magnitude + 1))
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def _highest_equivalent(self, index):
+        if index < self._sub_bucket_count:
+            return index
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, latency_ms):
+        value = min(max(int(latency_ms * 1000), 0), self.highest_us)
+        self.counts[self._index(value)] += 1
+        self.total_count += 1
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other):
+        if (other.highest_us, other.significant_figures) != (self.highest_us, self.significant_figures):
+            raise ValueError("Cannot merge histograms with different layouts")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self):
+        """Sparse JSON-friendly form: only non-empty buckets are stored"""
+        return {
+            'highest_us': self.highest_us,
+            'significant_figures': self.significant_figures,
+            'max_us': self.max_us,
+            'counts': {str(index): count for index, count in enumerate(self.counts) if count},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['highest_us'], data['significant_figures'])
+        for index, count in data['counts'].items():
+            histogram.counts[int(index)] = count
+            histogram.total_count += count
+        histogram.max_us = data['max_us']
+        return histogram
+
+    def value_at_percentile(self, pct):
+        """Latency in ms at or below which `pct` percent of samples fall"""
+        if not self.total_count:
+            return float('nan')
+        target = max(1, math.ceil(pct / 100 * self.total_count))
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def mean(self):
+        """Approximate mean in ms, using each bucket's upper bound"""
+        if not self.total_count:
+            return float('nan')
+        total = sum(self._highest_equivalent(index) * count
+                    for index, count in enumerate(self.counts) if count)
+        return total / self.total_count / 1000
+
+
+class LoadResult:
+    """Outcome of driving one scenario at one concurrency or arrival rate"""
+
+    def __init__(self, name, concurrency=None, target_rate=None):
+        self.name = name
+        self.concurrency = concurrency
+        self.target_rate = target_rate
+        self.meets_slo = None
+        self.max_send_lag_ms = 0.0
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.bytes_received = 0
+        self.duration = 0.0
+
+    @property
+    def key(self):
+        """Stable identifier used to match this result against a baseline"""
+        if self.concurrency:
+            return f"{self.name} @ {self.concurrency}c"
+        if self.target_rate:
+            return f"{self.name} @ {self.target_rate:g}/s"
+        return self.name
+
+    def record(self, latency_ms, ok, nbytes=0):
+        self.bytes_received += nbytes
+        if ok:
+            self.histogram.record(latency_ms)
+        else:
+            self.errors += 1
+
+    def merge(self, other):
+        """Fold in the result of another worker process running the same step"""
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+        self.bytes_received += other.bytes_received
+        self.duration = max(self.duration, other.duration)
+        self.max_send_lag_ms = max(self.max_send_lag_ms, other.max_send_lag_ms)
+
+    @property
+    def successes(self):
+        return self.histogram.total_count
+
+    @property
+    def requests(self):
+        return self.successes + self.errors
+
+    @property
+    def throughput(self):
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self):
+        return self.errors / self.requests if self.requests else 0.0
+
+    def percentiles(self):
+        return {pct: self.histogram.value_at_percentile(pct) for pct in PERCENTILES}
+
+
+def print_load_table(results):
+    """Print one row per scenario and concurrency (or target rate)"""
+    header = f"{'Scenario':<28}{'Load':>8}{'Req/s':>10}{'Errors':>9}"
+    header += ''.join(f"{'p' + format(pct, 'g'):>10}" for pct in PERCENTILES)
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if result.concurrency:
+            load = f"{result.concurrency}c"
+        else:
+            load = f"{result.target_rate:g}/s" if result.target_rate else '—'
+        row = f"{result.name:<28}{load:>8}{result.throughput:>10.1f}{result.error_rate:>8.1%} "
+        row += ''.join(f"{value:>8.1f}ms" for value in result.percentiles().values())
+        print(row)
+
+
+def linear_fit(xs, ys):
+    """Least-squares slope and intercept of ys against xs"""
+    n = len(xs)
+    if n < 2:
+        return 0.0, (ys[0] if ys else 0.0)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+    return slope, mean_y - slope * mean_x
+
+
+def slope_t(xs, ys, slope, intercept):
+    """t statistic of a least-squares slope"""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    residual = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    if n < 3 or not spread:
+        return 0.0
+    if not residual:
+        return math.inf if slope > 0 else -math.inf if slope < 0 else 0.0
+    return slope / math.sqrt(residual / (n - 2) / spread)
+
+
+def mann_whitney_greater(baseline, current):
+    """One-sided Mann-Whitney U test that `current` latencies exceed `baseline`.
+
+    Works directly on two LatencyHistograms: samples sharing a bucket are
+    treated as ties, so the test needs no raw samples. Returns (z, p_value).
+    """
+    n1, n2 = baseline.total_count, current.total_count
+    if not n1 or not n2:
+        return 0.0, 1.0
+    u = 0.0
+    baseline_below = 0
+    tie_term = 0
+    for base_count, cur_count in zip(baseline.counts, current.counts):
+        if cur_count:
+            u += cur_count * (baseline_below + 0.5 * base_count)
+        baseline_below += base_count
+        tied = base_count + cur_count
+        tie_term += tied ** 3 - tied
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 0.0, 1.0
+    z = (u - mean) / math.sqrt(variance)
+    return z, 0.5 * math.erfc(z / math.sqrt(2))
\ No newline at end of file
@@ -0,0 +1 @@
+"""Unit checks for the harness helpers: python -m pytest backend_harness/tests"""
\ No newline at end of file
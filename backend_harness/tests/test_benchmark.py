@@ -0,0 +1,57 @@
+import unittest
+
+from backend_harness.benchmark import MIN_REGRESSION_SAMPLES, build_benchmark, compare_to_baseline
+from backend_harness.stats import LoadResult
+
+
+def benchmark_of(mode='functional', **latencies_by_route):
+    results = []
+    for name, latencies in latencies_by_route.items():
+        result = LoadResult(name)
+        for latency in latencies:
+            result.record(latency, ok=True)
+        result.duration = 1.0
+        results.append(result)
+    return build_benchmark(mode, results, base_url='http://stand-in/api')
+
+
+class CompareToBaselineTest(unittest.TestCase):
+
+    def test_large_samples_use_the_rank_test(self):
+        baseline = benchmark_of(list=[10 + i % 5 for i in range(200)])
+        slower = benchmark_of(list=[20 + i % 5 for i in range(200)])
+        regressions, skipped, compared = compare_to_baseline(slower, baseline)
+        self.assertEqual((len(regressions), skipped, compared), (1, [], 1))
+        self.assertIn('p=', regressions[0][1])
+        self.assertEqual(compare_to_baseline(baseline, baseline), ([], [], 1))
+
+    def test_slowdown_within_tolerance_is_ignored(self):
+        baseline = benchmark_of(list=[100 + i % 5 for i in range(200)])
+        current = benchmark_of(list=[105 + i % 5 for i in range(200)])
+        self.assertEqual(compare_to_baseline(current, baseline)[0], [])
+
+    def test_small_samples_use_the_slowdown_threshold(self):
+        few = MIN_REGRESSION_SAMPLES - 1
+        baseline = benchmark_of(root=[10] * few, detail=[10] * few)
+        current = benchmark_of(root=[15] * few, detail=[30] * few)
+        regressions, skipped, compared = compare_to_baseline(current, baseline)
+        self.assertEqual([key for key, _ in regressions], ['detail'])
+        self.assertIn(f"threshold test on n={few}", regressions[0][1])
+        self.assertEqual((skipped, compared), ([], 2))
+
+    def test_unmatched_routes_are_reported_as_skipped(self):
+        baseline = benchmark_of(root=[10] * 5, gone=[10] * 5, failing=[])
+        current = benchmark_of(root=[10] * 5, new=[10] * 5, failing=[])
+        _, skipped, compared = compare_to_baseline(current, baseline)
+        self.assertEqual(sorted(skipped), [('failing', 'no successful samples'), ('gone', 'missing from this run'),
+                                           ('new', 'not in baseline')])
+        self.assertEqual(compared, 1)
+
+    def test_mode_mismatch_compares_nothing(self):
+        regressions, skipped, compared = compare_to_baseline(benchmark_of('load', root=[1]), benchmark_of(root=[1]))
+        self.assertEqual((regressions, compared), ([], 0))
+        self.assertEqual(skipped[0][0], '*')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import unittest
+
+from backend_harness.client import parse_server_timing
+
+
+class ParseServerTimingTest(unittest.TestCase):
+
+    def test_metrics_with_and_without_duration(self):
+        header = 'db;dur=53.2, cache;desc="Cache Read";dur=23.2, miss, app;dur="7"'
+        self.assertEqual(parse_server_timing(header), {'db': 53.2, 'cache': 23.2, 'miss': None, 'app': 7.0})
+
+    def test_quoted_description_may_contain_commas_and_semicolons(self):
+        header = 'app;desc="Stand-in, handler; v2";dur=1.5, total;dur=2'
+        self.assertEqual(parse_server_timing(header), {'app': 1.5, 'total': 2.0})
+
+    def test_parameter_names_are_case_insensitive(self):
+        self.assertEqual(parse_server_timing('edge;DUR=4'), {'edge': 4.0})
+
+    def test_malformed_duration_is_ignored(self):
+        self.assertEqual(parse_server_timing('app;dur=fast'), {'app': None})
+
+    def test_missing_or_empty_header(self):
+        self.assertEqual(parse_server_timing(None), {})
+        self.assertEqual(parse_server_timing(''), {})
+        self.assertEqual(parse_server_timing(' , ;dur=1'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
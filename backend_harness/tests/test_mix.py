@@ -0,0 +1,56 @@
+import unittest
+
+from backend_harness.modes.mix import DEFAULT_TRAFFIC_MIX, MIX_OPERATIONS, mix_sends_email, parse_traffic_mix
+
+
+class ParseTrafficMixTest(unittest.TestCase):
+
+    def test_default_mix(self):
+        mix = parse_traffic_mix(DEFAULT_TRAFFIC_MIX)
+        self.assertEqual(mix['rate'], 10.0)
+        self.assertEqual(len(mix['sessions']), len(DEFAULT_TRAFFIC_MIX['sessions']))
+        review = next(session for session in mix['sessions'] if session['name'] == 'review')
+        self.assertEqual(review['steps'], [{'op': 'detail', 'think_time': (0.5, 3.0)},
+                                           {'op': 'review', 'think_time': (5.0, 15.0)}])
+
+    def test_public_facing_writes_target_test_agencies(self):
+        for name in ('review', 'contact_agency'):
+            self.assertEqual(MIX_OPERATIONS[name].agency, 'test')
+        self.assertTrue(mix_sends_email(parse_traffic_mix(DEFAULT_TRAFFIC_MIX)))
+        self.assertFalse(mix_sends_email(parse_traffic_mix({'sessions': [{'steps': ['list', 'detail', 'review']}]})))
+
+    def test_think_time_defaults_and_overrides(self):
+        mix = parse_traffic_mix({'rate': 2, 'think_time': 1, 'sessions': [
+            {'steps': ['root', {'op': 'list', 'think_time': [0, 2]}]},
+            {'name': 'quick', 'think_time': 0, 'steps': ['search']},
+        ]})
+        first, second = mix['sessions']
+        self.assertEqual(first['name'], 'session 1')
+        self.assertEqual(first['weight'], 1.0)
+        self.assertEqual([step['think_time'] for step in first['steps']], [(1.0, 1.0), (0.0, 2.0)])
+        self.assertEqual(second['steps'], [{'op': 'search', 'think_time': (0.0, 0.0)}])
+
+    def test_rejects_invalid_rates(self):
+        for rate in (0, -5, float('inf'), float('nan')):
+            with self.assertRaises(ValueError, msg=rate):
+                parse_traffic_mix(dict(DEFAULT_TRAFFIC_MIX, rate=rate))
+
+    def test_rejects_invalid_sessions(self):
+        invalid = [
+            None,
+            {'sessions': []},
+            {'sessions': [{'name': 'x', 'steps': ['teleport']}]},
+            {'sessions': [{'name': 'x', 'steps': []}]},
+            {'sessions': [{'name': 'x', 'weight': 0, 'steps': ['root']}]},
+            {'sessions': [{'name': 'x', 'steps': ['update', 'create']}]},
+            {'sessions': [{'name': 'x', 'think_time': [3, 1], 'steps': ['root']}]},
+            {'sessions': [{'name': 'x', 'steps': [{'op': 'root', 'think_time': -1}]}]},
+            {'think_time': 'slow', 'sessions': [{'steps': ['root']}]},
+        ]
+        for spec in invalid:
+            with self.assertRaises(ValueError, msg=spec):
+                parse_traffic_mix(spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import asyncio
+import json
+import math
+import unittest
+
+from backend_harness.client import AsyncResponse
+from backend_harness.modes.pagination import JSONArrayStream, sweep_pagination
+
+
+def stream_items(document, chunk_size, key='agencies'):
+    items = []
+    stream = JSONArrayStream(key, items.append)
+    data = document.encode()
+    for start in range(0, len(data), chunk_size):
+        stream.feed(data[start:start + chunk_size])
+    return items, stream.close()
+
+
+class JSONArrayStreamTest(unittest.TestCase):
+
+    document = json.dumps({
+        'total': 3,
+        'agencies': [
+            {'id': 'a1', 'name': 'Brighter Futures', 'tags': ['[', ']'], 'note': 'quote " and , inside'},
+            {'id': 'a2', 'name': 'Côte Fostering', 'nested': {'agencies': []}},
+            {'id': 'a3', 'name': 'Fostering “Plus” 💙', 'rating': 4.5},
+        ],
+        'pagination': {'page': 1, 'limit': 3},
+    }, ensure_ascii=False)
+
+    def test_any_chunking_yields_the_same_items(self):
+        expected = json.loads(self.document)
+        for chunk_size in (1, 2, 3, 7, 64, len(self.document.encode())):
+            items, rest = stream_items(self.document, chunk_size)
+            self.assertEqual(items, expected['agencies'], chunk_size)
+            self.assertEqual(rest, dict(expected, agencies=[]), chunk_size)
+
+    def test_empty_array(self):
+        items, rest = stream_items('{"agencies": [], "total": 0}', 4)
+        self.assertEqual(items, [])
+        self.assertEqual(rest, {'agencies': [], 'total': 0})
+
+    def test_scalar_items(self):
+        items, _ = stream_items('{"agencies":[1, "two", null, true]}', 3)
+        self.assertEqual(items, [1, 'two', None, True])
+
+    def test_truncated_body(self):
+        with self.assertRaises(ValueError):
+            stream_items('{"agencies": [{"id": 1}, {"id"', 5)
+        with self.assertRaises(ValueError):
+            stream_items('{"error": "Internal server error"}', 5)
+
+
+class FakeListing:
+    """Serves GET /agencies pages over `total` rows in one chunk each"""
+
+    def __init__(self, total):
+        self.total = total
+
+    async def request(self, method, path, on_chunk=None, params=None):
+        page, limit = int(params['page']), int(params['limit'])
+        ids = range((page - 1) * limit, min(page * limit, self.total))
+        body = json.dumps({'agencies': [{'id': i} for i in ids],
+                           'pagination': {'total': self.total, 'pages': math.ceil(self.total / limit)}}).encode()
+        on_chunk(body)
+        return AsyncResponse(200, {}, b'')
+
+
+class SweepPaginationTest(unittest.TestCase):
+
+    def test_full_walk(self):
+        sweep = asyncio.run(sweep_pagination(FakeListing(25), 10))
+        self.assertTrue(sweep.complete)
+        self.assertEqual(len(sweep.pages), 3)
+        self.assertEqual((sweep.skipped, sweep.duplicates), (0, {}))
+
+    def test_max_pages_is_not_a_skip(self):
+        sweep = asyncio.run(sweep_pagination(FakeListing(25), 10, max_pages=2))
+        self.assertFalse(sweep.complete)
+        self.assertEqual(len(sweep.id_counts), 20)
+        self.assertEqual(sweep.skipped, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
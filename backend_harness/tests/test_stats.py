@@ -0,0 +1,130 @@
+import math
+import random
+import unittest
+
+from backend_harness.stats import LatencyHistogram, linear_fit, slope_t, mann_whitney_greater
+
+
+def histogram_of(latencies_ms):
+    histogram = LatencyHistogram()
+    for latency in latencies_ms:
+        histogram.record(latency)
+    return histogram
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in (0, 1, 999, 2047):
+            self.assertEqual(histogram._index(value), value)
+            self.assertEqual(histogram._highest_equivalent(value), value)
+
+    def test_bucket_bounds_keep_three_significant_figures(self):
+        histogram = LatencyHistogram()
+        previous = -1
+        values = sorted(list(range(0, 70_000, 7)) + [2 ** k - 1 for k in range(12, 26)] + [histogram.highest_us])
+        for value in values:
+            index = histogram._index(value)
+            upper = histogram._highest_equivalent(index)
+            self.assertLess(index, len(histogram.counts))
+            self.assertGreaterEqual(index, previous)
+            self.assertGreaterEqual(upper, value)
+            self.assertLessEqual(upper - value, value / 1000 + 1)
+            previous = index
+
+    def test_percentiles(self):
+        histogram = histogram_of(range(1, 101))
+        self.assertAlmostEqual(histogram.value_at_percentile(50), 50, places=1)
+        self.assertAlmostEqual(histogram.value_at_percentile(99), 99, places=1)
+        self.assertEqual(histogram.value_at_percentile(100), 100)
+        self.assertTrue(math.isnan(LatencyHistogram().value_at_percentile(50)))
+
+    def test_values_are_clamped(self):
+        histogram = histogram_of([-5, 10 ** 9])
+        self.assertEqual(histogram.total_count, 2)
+        self.assertEqual(histogram.max_us, histogram.highest_us)
+
+    def test_merge_matches_recording_everything_once(self):
+        rng = random.Random(7)
+        first = [rng.expovariate(1 / 40) for _ in range(500)]
+        second = [rng.expovariate(1 / 400) for _ in range(300)]
+        merged = histogram_of(first)
+        merged.merge(histogram_of(second))
+        combined = histogram_of(first + second)
+        self.assertEqual(list(merged.counts), list(combined.counts))
+        self.assertEqual(merged.total_count, 800)
+        self.assertEqual(merged.max_us, combined.max_us)
+
+    def test_merge_rejects_a_different_layout(self):
+        with self.assertRaises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(significant_figures=2))
+
+    def test_dict_round_trip(self):
+        histogram = histogram_of([0.5, 3, 3, 250, 12_000])
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+        self.assertEqual(list(restored.counts), list(histogram.counts))
+        self.assertEqual(restored.total_count, histogram.total_count)
+        self.assertEqual(restored.max_us, histogram.max_us)
+
+
+class MannWhitneyTest(unittest.TestCase):
+
+    def test_identical_samples_are_not_slower(self):
+        samples = [10, 20, 30, 40] * 25
+        z, p_value = mann_whitney_greater(histogram_of(samples), histogram_of(samples))
+        self.assertAlmostEqual(z, 0.0)
+        self.assertAlmostEqual(p_value, 0.5)
+
+    def test_known_statistic_without_ties(self):
+        # U = 2 + 3 + 3 = 8 of 9 pairs; mean 4.5, variance 9 * 7 / 12
+        z, p_value = mann_whitney_greater(histogram_of([1, 2, 3]), histogram_of([2.5, 4, 5]))
+        self.assertAlmostEqual(z, 3.5 / math.sqrt(9 * 7 / 12))
+        self.assertAlmostEqual(p_value, 0.5 * math.erfc(z / math.sqrt(2)))
+
+    def test_slower_run_is_significant_and_faster_is_not(self):
+        rng = random.Random(3)
+        baseline = histogram_of(rng.gauss(50, 5) for _ in range(200))
+        slower = histogram_of(rng.gauss(60, 5) for _ in range(200))
+        self.assertLess(mann_whitney_greater(baseline, slower)[1], 1e-6)
+        self.assertGreater(mann_whitney_greater(slower, baseline)[1], 0.99)
+
+    def test_empty_side(self):
+        self.assertEqual(mann_whitney_greater(LatencyHistogram(), histogram_of([1])), (0.0, 1.0))
+
+
+class TrendTest(unittest.TestCase):
+
+    def test_linear_fit(self):
+        slope, intercept = linear_fit([0, 1, 2, 3], [1, 3, 5, 7])
+        self.assertAlmostEqual(slope, 2)
+        self.assertAlmostEqual(intercept, 1)
+
+    def test_linear_fit_degenerate_inputs(self):
+        self.assertEqual(linear_fit([], []), (0.0, 0.0))
+        self.assertEqual(linear_fit([4], [9]), (0.0, 9))
+        self.assertEqual(linear_fit([2, 2, 2], [1, 2, 3]), (0.0, 2))
+
+    def test_slope_t(self):
+        xs, ys = [0, 1, 2, 3, 4], [1.0, 2.2, 2.8, 4.1, 5.0]
+        slope, intercept = linear_fit(xs, ys)
+        residual = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+        expected = slope / math.sqrt(residual / 3 / 10)
+        self.assertAlmostEqual(slope_t(xs, ys, slope, intercept), expected)
+
+    def test_slope_t_without_noise(self):
+        self.assertEqual(slope_t([0, 1, 2], [0, 1, 2], 1.0, 0.0), math.inf)
+        self.assertEqual(slope_t([0, 1, 2], [2, 1, 0], -1.0, 2.0), -math.inf)
+        self.assertEqual(slope_t([0, 1, 2], [1, 1, 1], 0.0, 1.0), 0.0)
+        self.assertEqual(slope_t([0, 1], [0, 5], 5.0, 0.0), 0.0)
+
+    def test_noisy_flat_series_is_not_a_trend(self):
+        rng = random.Random(11)
+        xs = list(range(30))
+        ys = [100 + rng.gauss(0, 20) for _ in xs]
+        slope, intercept = linear_fit(xs, ys)
+        self.assertLess(abs(slope_t(xs, ys, slope, intercept)), 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
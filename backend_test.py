@@ -5,42 +5,192 @@ Tests all backend API endpoints for functionality and error handling.
 """
 
 import requests
-import json
 import sys
 import os
-from datetime import datetime
+import re
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+from backend_harness.config import API_BASE, POOL_SIZE, MAX_RETRIES, RETRY_BACKOFF, AGENCY_LIST_FILTERS
+from backend_harness.client import connection_phases, parse_server_timing, create_session
+from backend_harness.stats import LoadResult
+from backend_harness.results import REQUEST_PHASES, TestRecord, PhaseBreakdown, ResultSink
+from backend_harness.benchmark import BENCHMARK_FILE, BASELINE_FILE, record_benchmark
+from backend_harness.standin import serve_stand_in, start_stand_in, start_email_sink
+from backend_harness.modes.load import LOAD_PROCESSES, run_load, run_open_loop
+from backend_harness.modes.pagination import run_pagination_sweep
+from backend_harness.modes.crawl import run_crawl
+from backend_harness.modes.writes import run_write_load
+from backend_harness.modes.revalidate import run_revalidation
+from backend_harness.modes.search import run_search_workload
+from backend_harness.modes.contact import run_contact_load
+from backend_harness.modes.soak import SOAK_SNAPSHOT_FILE, run_soak
+from backend_harness.modes.mix import (DEFAULT_TRAFFIC_MIX, parse_traffic_mix, load_traffic_mix, mix_sends_email,
+                                       run_traffic_mix)
+
+
+# Tests that consume agency IDs must wait until the listing and create tests
+# have populated them; everything else can run as soon as a worker is free.
+TEST_ORDER = [
+    'test_root_endpoint',
+    'test_list_agencies',
+    'test_get_single_agency',
+    'test_create_agency',
+    'test_update_agency',
+    'test_add_review',
+    'test_contact_agency',
+    'test_general_contact',
+]
+
+# The contact tests email the listed agency for real, so a soak must never repeat them
+SOAK_TESTS = [name for name in TEST_ORDER if name not in ('test_contact_agency', 'test_general_contact')]
+
+TEST_DEPENDENCIES = {
+    'test_get_single_agency': ('test_list_agencies', 'test_create_agency'),
+    'test_update_agency': ('test_list_agencies', 'test_create_agency'),
+    'test_add_review': ('test_list_agencies', 'test_create_agency'),
+    'test_contact_agency': ('test_list_agencies', 'test_create_agency'),
+}
 
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
-API_BASE = f"{BASE_URL}/api"
 
 class APITester:
-    def __init__(self):
-        self.results = []
+    def __init__(self, pool_size=POOL_SIZE, max_retries=MAX_RETRIES, backoff_factor=RETRY_BACKOFF,
+                 results_file=None, api_base=API_BASE):
+        self.api_base = api_base
+        self.results = ResultSink(results_file)
         self.agency_ids = []
-        
+        self.session = create_session(pool_size, max_retries, backoff_factor)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listed_ids_recorded = False
+        self.endpoint_stats = {}
+        self.phase_stats = {}
+        self.verbose = True
+        self.created_agency_ids = []
+        self.write_own_agency = False
+
+    def _request(self, method, url, **kwargs):
+        """Send a request on the shared session, recording its wall-clock time.
+
+        The time is also split into connection setup (dns, connect, tls),
+        waiting for the first byte (ttfb), reading the body (download) and
+        decoding JSON (decode). The decoded body is kept per thread so the
+        tests read it through _json() instead of parsing it twice.
+        """
+        phases = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+        self._local.last_json = None
+        connection_phases.phases = phases
+        start = time.perf_counter()
+        response = None
+        server_timing = None
+        try:
+            response = self.session.request(method, url, stream=True, **kwargs)
+            headers_at = time.perf_counter()
+            response.content
+            body_at = time.perf_counter()
+            setup_ms = phases['dns'] + phases['connect'] + phases['tls']
+            phases['ttfb'] = max(0.0, (headers_at - start) * 1000 - setup_ms)
+            phases['download'] = (body_at - headers_at) * 1000
+            if 'json' in response.headers.get('Content-Type', ''):
+                try:
+                    data = response.json()
+                except ValueError:
+                    pass
+                else:
+                    phases['decode'] = (time.perf_counter() - body_at) * 1000
+                    self._local.last_json = (response, data)
+            server_timing = parse_server_timing(response.headers.get('Server-Timing')) or None
+            return response
+        finally:
+            connection_phases.phases = None
+            elapsed_ms = (body_at - start) * 1000 if 'download' in phases else (time.perf_counter() - start) * 1000
+            self._local.last_elapsed_ms = elapsed_ms
+            self._local.last_phases = {name: round(value, 3) for name, value in phases.items()}
+            self._local.last_server_timing = server_timing
+            self._record_endpoint(method, url, elapsed_ms, response, phases, server_timing)
+
+    def _json(self, response):
+        """Decoded body of `response`, reusing the parse _request already timed"""
+        cached = getattr(self._local, 'last_json', None)
+        if cached is not None and cached[0] is response:
+            return cached[1]
+        return response.json()
+
+    def _record_endpoint(self, method, url, elapsed_ms, response, phases, server_timing):
+        """Aggregate latency, payload size and phases per route"""
+        route = re.sub(r'/agencies/[^/?]+', '/agencies/:id', urlsplit(url).path)
+        key = f"{method} {route}"
+        ok = response is not None and response.status_code < 500
+        nbytes = len(response.content) if response is not None else 0
+        with self._lock:
+            stats = self.endpoint_stats.get(key)
+            if stats is None:
+                stats = self.endpoint_stats[key] = LoadResult(key)
+            stats.record(elapsed_ms, ok, nbytes)
+            if response is not None:
+                self.phase_stats.setdefault(key, PhaseBreakdown()).record(phases, server_timing)
+
+    def _record_listed_agency_ids(self, ids):
+        """Put the first listed agency IDs in front of any created ones"""
+        with self._lock:
+            if not self._listed_ids_recorded and ids:
+                self.agency_ids[:0] = ids
+                self._listed_ids_recorded = True
+
+    def reset_agency_ids(self):
+        """Forget collected agency IDs so the next run lists and creates afresh"""
+        with self._lock:
+            self.agency_ids = []
+            self._listed_ids_recorded = False
+
+    def _record_created_agency_id(self, agency_id):
+        """Append a newly created agency ID so update tests pick it up last"""
+        with self._lock:
+            self.agency_ids.append(agency_id)
+            self.created_agency_ids.append(agency_id)
+
+    def delete_created_agencies(self):
+        """DELETE every agency the tests created so far; returns how many went"""
+        with self._lock:
+            created, self.created_agency_ids = self.created_agency_ids, []
+        deleted = 0
+        for agency_id in created:
+            try:
+                response = self.session.delete(f"{self.api_base}/agencies/{agency_id}", timeout=10)
+                deleted += response.status_code == 200
+            except requests.RequestException:
+                pass
+        return deleted
+
     def log_result(self, test_name, success, details, response_code=None):
-        """Log test result"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'details': details,
-            'response_code': response_code,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.results.append(result)
+        """Log test result along with the time taken by the preceding request"""
+        elapsed_ms = getattr(self._local, 'last_elapsed_ms', None)
+        phases = getattr(self._local, 'last_phases', None)
+        server_timing = getattr(self._local, 'last_server_timing', None)
+        self._local.last_elapsed_ms = self._local.last_phases = self._local.last_server_timing = None
+        result = TestRecord(test_name, success, details, response_code, elapsed_ms,
+                            phases=phases, server_timing=server_timing)
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {details}")
+        lines = [f"{status} {test_name}: {details}"]
         if response_code:
-            print(f"    Response Code: {response_code}")
+            lines.append(f"    Response Code: {response_code}")
+        if elapsed_ms is not None:
+            lines.append(f"    Latency: {elapsed_ms:.1f} ms")
+        with self._lock:
+            self.results.add(result)
+            if self.verbose:
+                print("\n".join(lines))
     
     def test_root_endpoint(self):
         """Test GET /api/ - Root endpoint"""
         try:
-            response = requests.get(f"{API_BASE}/", timeout=10)
+            response = self._request('GET', f"{self.api_base}/", timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if 'message' in data and 'Foster Care Directory UK API' in data['message']:
                     self.log_result("Root API endpoint", True, 
                                   f"API info returned correctly: {data['message']}", 
@@ -58,26 +208,17 @@ class APITester:
     
     def test_list_agencies(self):
         """Test GET /api/agencies with various filters"""
-        tests = [
-            ("Basic list", {}),
-            ("Featured agencies", {"featured": "true"}),
-            ("Search by location", {"search": "London"}),
-            ("Filter by type", {"type": "Private"}),
-            ("Pagination", {"page": "1", "limit": "3"})
-        ]
-        
-        for test_name, params in tests:
+        for test_name, params in AGENCY_LIST_FILTERS:
             try:
-                response = requests.get(f"{API_BASE}/agencies", params=params, timeout=10)
+                response = self._request('GET', f"{self.api_base}/agencies", params=params, timeout=10)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
                     if 'agencies' in data and 'pagination' in data:
                         agencies = data['agencies']
                         
                         # Store agency IDs for later tests
-                        if not self.agency_ids and agencies:
-                            self.agency_ids = [agency['id'] for agency in agencies[:3]]
+                        self._record_listed_agency_ids([agency['id'] for agency in agencies[:3]])
                         
                         # Validate specific filters
                         if params.get('featured') == 'true':
@@ -135,10 +276,10 @@ class APITester:
         # Test with valid ID
         try:
             agency_id = self.agency_ids[0]
-            response = requests.get(f"{API_BASE}/agencies/{agency_id}", timeout=10)
+            response = self._request('GET', f"{self.api_base}/agencies/{agency_id}", timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if 'agency' in data and data['agency'].get('id') == agency_id:
                     self.log_result("Get single agency - Valid ID", True, 
                                   f"Agency retrieved successfully: {data['agency']['name']}", 
@@ -156,10 +297,10 @@ class APITester:
         
         # Test with invalid ID
         try:
-            response = requests.get(f"{API_BASE}/agencies/invalid-id-123", timeout=10)
+            response = self._request('GET', f"{self.api_base}/agencies/invalid-id-123", timeout=10)
             
             if response.status_code == 404:
-                data = response.json()
+                data = self._json(response)
                 if 'error' in data:
                     self.log_result("Get single agency - Invalid ID", True, 
                                   "Correctly returned 404 for invalid ID", 
@@ -194,18 +335,18 @@ class APITester:
         }
         
         try:
-            response = requests.post(f"{API_BASE}/agencies", 
-                                   json=new_agency, 
-                                   headers={'Content-Type': 'application/json'},
-                                   timeout=10)
+            response = self._request('POST', f"{self.api_base}/agencies", 
+                                     json=new_agency,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=10)
             
             if response.status_code == 201:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success') and 'agency' in data:
                     created_agency = data['agency']
                     if created_agency.get('name') == new_agency['name']:
                         # Store the created agency ID for update test
-                        self.agency_ids.append(created_agency['id'])
+                        self._record_created_agency_id(created_agency['id'])
                         self.log_result("Create agency", True, 
                                       f"Agency created successfully: {created_agency['name']}", 
                                       response.status_code)
@@ -230,20 +371,26 @@ class APITester:
             self.log_result("Update agency", False, "No agency IDs available for update test")
             return
         
-        agency_id = self.agency_ids[-1]  # Use the last (newly created) agency
+        if self.write_own_agency:
+            if not self.created_agency_ids:
+                self.log_result("Update agency", False, "No created agency available for update test")
+                return
+            agency_id = self.created_agency_ids[-1]
+        else:
+            agency_id = self.agency_ids[-1]  # Use the last (newly created) agency
         update_data = {
             "description": "Updated description for testing",
             "recruiting": False
         }
         
         try:
-            response = requests.put(f"{API_BASE}/agencies/{agency_id}", 
-                                  json=update_data,
-                                  headers={'Content-Type': 'application/json'},
-                                  timeout=10)
+            response = self._request('PUT', f"{self.api_base}/agencies/{agency_id}", 
+                                     json=update_data,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success') and 'agency' in data:
                     updated_agency = data['agency']
                     if (updated_agency.get('description') == update_data['description'] and
@@ -272,7 +419,13 @@ class APITester:
             self.log_result("Add agency review", False, "No agency IDs available for review test")
             return
         
-        agency_id = self.agency_ids[0]
+        if self.write_own_agency:
+            if not self.created_agency_ids:
+                self.log_result("Add agency review", False, "No created agency available for review test")
+                return
+            agency_id = self.created_agency_ids[-1]
+        else:
+            agency_id = self.agency_ids[0]
         review_data = {
             "userId": "test-user-123",
             "userName": "Sarah Foster",
@@ -281,13 +434,13 @@ class APITester:
         }
         
         try:
-            response = requests.post(f"{API_BASE}/agencies/{agency_id}/reviews", 
-                                   json=review_data,
-                                   headers={'Content-Type': 'application/json'},
-                                   timeout=10)
+            response = self._request('POST', f"{self.api_base}/agencies/{agency_id}/reviews", 
+                                     json=review_data,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=10)
             
             if response.status_code == 201:
-                data = response.json()
+                data = self._json(response)
                 if (data.get('success') and 'review' in data and 'agency' in data):
                     review = data['review']
                     agency_info = data['agency']
@@ -326,13 +479,13 @@ class APITester:
         }
         
         try:
-            response = requests.post(f"{API_BASE}/contact/agency", 
-                                   json=contact_data,
-                                   headers={'Content-Type': 'application/json'},
-                                   timeout=15)  # Longer timeout for email
+            response = self._request('POST', f"{self.api_base}/contact/agency", 
+                                     json=contact_data,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=15)  # Longer timeout for email
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success'):
                     self.log_result("Contact agency", True, 
                                   f"Contact form submitted successfully", 
@@ -343,7 +496,7 @@ class APITester:
                                   response.status_code)
             elif response.status_code == 500:
                 # Email might fail due to Resend API issues - this is acceptable
-                data = response.json()
+                data = self._json(response)
                 if 'email' in data.get('error', '').lower():
                     self.log_result("Contact agency", True, 
                                   f"Minor: Email sending failed (expected with test API key) - endpoint working", 
@@ -368,13 +521,13 @@ class APITester:
         }
         
         try:
-            response = requests.post(f"{API_BASE}/contact/general", 
-                                   json=contact_data,
-                                   headers={'Content-Type': 'application/json'},
-                                   timeout=15)  # Longer timeout for email
+            response = self._request('POST', f"{self.api_base}/contact/general", 
+                                     json=contact_data,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=15)  # Longer timeout for email
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success'):
                     self.log_result("General contact", True, 
                                   f"General contact form submitted successfully", 
@@ -385,7 +538,7 @@ class APITester:
                                   response.status_code)
             elif response.status_code == 500:
                 # Email might fail due to Resend API issues - this is acceptable
-                data = response.json()
+                data = self._json(response)
                 if 'email' in data.get('error', '').lower():
                     self.log_result("General contact", True, 
                                   f"Minor: Email sending failed (expected with test API key) - endpoint working", 
@@ -401,46 +554,369 @@ class APITester:
         except Exception as e:
             self.log_result("General contact", False, f"Request failed: {str(e)}")
     
-    def run_all_tests(self):
+    def print_phase_breakdown(self):
+        """Median of each request phase and Server-Timing metric per endpoint"""
+        if not self.phase_stats:
+            return
+        metrics = sorted({name for stats in self.phase_stats.values() for name in stats.server_timing})
+        print("\n🔬 PHASE BREAKDOWN (p50 ms)")
+        header = f"   {'Endpoint':<32}" + ''.join(f"{name:>10}" for name in REQUEST_PHASES)
+        header += ''.join(f"{'st:' + name:>12}" for name in metrics)
+        print(header)
+        for key, stats in sorted(self.phase_stats.items()):
+            row = f"   {key:<32}"
+            for name in REQUEST_PHASES:
+                histogram = stats.phases.get(name)
+                row += f"{histogram.value_at_percentile(50):>10.1f}" if histogram else f"{'-':>10}"
+            for name in metrics:
+                histogram = stats.server_timing.get(name)
+                row += f"{histogram.value_at_percentile(50):>12.1f}" if histogram else f"{'-':>12}"
+            print(row)
+
+    def _run_timed(self, test_name):
+        """Run a single test method and return its duration in seconds"""
+        start = time.perf_counter()
+        getattr(self, test_name)()
+        return time.perf_counter() - start
+
+    def _run_parallel(self, max_workers, tests=TEST_ORDER):
+        """Run tests on a thread pool as soon as their dependencies finish"""
+        durations = {}
+        pending = list(tests)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                ready = [name for name in pending
+                         if all(dep in durations or dep not in tests for dep in TEST_DEPENDENCIES.get(name, ()))]
+                for name in ready:
+                    pending.remove(name)
+                    running[pool.submit(self._run_timed, name)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    durations[running.pop(future)] = future.result()
+        return durations
+
+    def run_all_tests(self, parallel=False, max_workers=4):
         """Run all backend API tests"""
         print(f"🚀 Starting Foster Care Directory UK Backend API Tests")
-        print(f"📍 Testing against: {API_BASE}")
+        print(f"📍 Testing against: {self.api_base}")
+        if parallel:
+            print(f"🧵 Running in parallel on {max_workers} workers")
         print("=" * 60)
         
-        # Run tests in order
-        self.test_root_endpoint()
-        self.test_list_agencies()
-        self.test_get_single_agency()
-        self.test_create_agency()
-        self.test_update_agency()
-        self.test_add_review()
-        self.test_contact_agency()
-        self.test_general_contact()
+        started = time.perf_counter()
+        if parallel:
+            durations = self._run_parallel(max_workers)
+        else:
+            # Run tests in order
+            durations = {name: self._run_timed(name) for name in TEST_ORDER}
+        wall_time = time.perf_counter() - started
+        for stats in self.endpoint_stats.values():
+            stats.duration = wall_time
         
         # Summary
         print("\n" + "=" * 60)
         print("📊 TEST SUMMARY")
         print("=" * 60)
         
-        passed = sum(1 for r in self.results if r['success'])
-        total = len(self.results)
+        self.results.flush()
+        passed = self.results.passed
+        total = self.results.total
         
         print(f"✅ Passed: {passed}")
         print(f"❌ Failed: {total - passed}")
         print(f"📈 Success Rate: {(passed/total)*100:.1f}%")
+
+        latency = self.results.latency
+        if latency.total_count:
+            print(f"⏱️  Latency: avg {self.results.latency_sum_ms / latency.total_count:.1f} ms, "
+                  f"median {latency.value_at_percentile(50):.1f} ms, "
+                  f"max {latency.max_us / 1000:.1f} ms over {latency.total_count} requests")
+        print(f"⏱️  Wall time: {wall_time:.2f} s (sum of tests {sum(durations.values()):.2f} s)")
+        if self.results.path:
+            print(f"📝 Results written to {self.results.path}")
+        self.print_phase_breakdown()
         
         # Show failed tests
-        failed_tests = [r for r in self.results if not r['success']]
-        if failed_tests:
+        if self.results.failures:
             print(f"\n❌ FAILED TESTS:")
-            for test in failed_tests:
-                print(f"   • {test['test']}: {test['details']}")
+            for test in self.results.failures:
+                print(f"   • {test.test}: {test.details}")
+            if self.results.failed > len(self.results.failures):
+                print(f"   … and {self.results.failed - len(self.results.failures)} more")
         
         return passed, total
 
+
 if __name__ == "__main__":
-    tester = APITester()
-    passed, total = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Foster Care Directory UK backend API tests")
+    # Each run does one thing; argparse rejects e.g. --load --soak instead of silently picking one
+    modes = parser.add_mutually_exclusive_group()
+    parser.add_argument('--parallel', action='store_true',
+                        help="run independent tests concurrently, honouring TEST_DEPENDENCIES")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="thread pool size for --parallel (default: 4)")
+    parser.add_argument('--pool-size', type=int, default=POOL_SIZE,
+                        help=f"HTTP connection pool size (default: {POOL_SIZE})")
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES,
+                        help=f"retries for idempotent requests (default: {MAX_RETRIES})")
+    modes.add_argument('--load', action='store_true',
+                       help="closed-loop load test of GET /api/agencies instead of the functional tests")
+    parser.add_argument('--concurrency', default='1,8,32',
+                        help="comma-separated worker counts for --load (default: 1,8,32)")
+    parser.add_argument('--duration', type=float, default=10,
+                        help="seconds to run each --load combination (default: 10)")
+    modes.add_argument('--open-loop', action='store_true',
+                       help="constant-arrival-rate ramp over the read endpoints")
+    parser.add_argument('--rates', default='25,50,100,200',
+                        help="comma-separated req/s steps for --open-loop (default: 25,50,100,200)")
+    parser.add_argument('--slo-p99', type=float, default=500,
+                        help="p99 latency SLO in ms for --open-loop (default: 500)")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="highest error fraction that still meets the SLO (default: 0.01)")
+    parser.add_argument('--max-connections', type=int, default=256,
+                        help="connection cap for --open-loop (default: 256)")
+    parser.add_argument('--processes', type=int, default=LOAD_PROCESSES,
+                        help=f"load generator processes for --load/--open-loop (default: {LOAD_PROCESSES})")
+    parser.add_argument('--results-file', default=os.getenv('API_TEST_RESULTS_FILE'),
+                        help="append every test result to this NDJSON file as it is logged")
+    modes.add_argument('--paginate', action='store_true',
+                       help="walk every page of GET /api/agencies for each --limits value")
+    parser.add_argument('--limits', default='10,50,100',
+                        help="comma-separated page sizes for --paginate (default: 10,50,100)")
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help="stop each --paginate walk after this many pages")
+    parser.add_argument('--pagination-output', default=None,
+                        help="CSV file for per-page latencies from --paginate")
+    modes.add_argument('--crawl', action='store_true',
+                       help="fetch every location page listed in the URL CSV")
+    parser.add_argument('--crawl-concurrency', type=int, default=16,
+                        help="concurrent connections for --crawl (default: 16)")
+    parser.add_argument('--warm-pass', action='store_true',
+                        help="repeat the --crawl to compare cold and warm cache behaviour")
+    parser.add_argument('--slowest', type=int, default=10,
+                        help="how many of the slowest pages --crawl reports (default: 10)")
+    modes.add_argument('--write-load', action='store_true',
+                       help="concurrent reviews and updates against throwaway agencies")
+    parser.add_argument('--write-agencies', type=int, default=3,
+                        help="agencies created for --write-load (default: 3)")
+    parser.add_argument('--write-requests', type=int, default=200,
+                        help="total reviews plus updates sent by --write-load (default: 200)")
+    parser.add_argument('--write-concurrency', type=int, default=16,
+                        help="concurrent connections for --write-load (default: 16)")
+    parser.add_argument('--update-ratio', type=float, default=0.2,
+                        help="fraction of --write-load requests that are PUT updates (default: 0.2)")
+    modes.add_argument('--revalidate', action='store_true',
+                       help="replay GETs with If-None-Match/If-Modified-Since and report 304 savings")
+    parser.add_argument('--revalidate-requests', type=int, default=500,
+                        help="GETs replayed by --revalidate (default: 500)")
+    parser.add_argument('--revalidate-concurrency', type=int, default=8,
+                        help="concurrent connections for --revalidate (default: 8)")
+    parser.add_argument('--validator-cache-size', type=int, default=128,
+                        help="LRU capacity of the client-side validator cache (default: 128)")
+    modes.add_argument('--search', action='store_true',
+                       help="Zipf-distributed search workload built from the location CSV")
+    parser.add_argument('--search-terms', type=int, default=300,
+                        help="distinct search terms to generate (default: 300)")
+    parser.add_argument('--search-requests', type=int, default=1000,
+                        help="searches sent by --search (default: 1000)")
+    parser.add_argument('--search-concurrency', type=int, default=8,
+                        help="concurrent connections for --search (default: 8)")
+    parser.add_argument('--zipf', type=float, default=1.1,
+                        help="Zipf exponent for term popularity (default: 1.1)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="random seed for generated workloads")
+    modes.add_argument('--contact-load', action='store_true',
+                       help="concurrent contact submissions with email time measured by a local sink")
+    parser.add_argument('--contact-requests', type=int, default=200,
+                        help="submissions sent by --contact-load (default: 200)")
+    parser.add_argument('--contact-concurrency', type=int, default=16,
+                        help="concurrent connections for --contact-load (default: 16)")
+    parser.add_argument('--email-delay', type=float, default=150.0,
+                        help="fixed delay in ms of the email sink (default: 150)")
+    parser.add_argument('--email-jitter', type=float, default=300.0,
+                        help="extra uniform random delay in ms of the email sink (default: 300)")
+    parser.add_argument('--email-failure-rate', type=float, default=0.02,
+                        help="fraction of emails the sink rejects with a 500 (default: 0.02)")
+    parser.add_argument('--email-sink-port', type=int, default=0,
+                        help="port for the email sink used by --contact-load and --mix, for RESEND_BASE_URL "
+                             "(default: any free port)")
+    modes.add_argument('--soak', action='store_true',
+                       help="repeat the functional tests continuously and watch for latency/error drift")
+    parser.add_argument('--soak-duration', type=float, default=3600,
+                        help="seconds to run --soak (default: 3600)")
+    parser.add_argument('--soak-window', type=float, default=60,
+                        help="length of each --soak percentile window in seconds (default: 60)")
+    parser.add_argument('--soak-snapshot', default=SOAK_SNAPSHOT_FILE,
+                        help=f"JSON snapshot rewritten after every --soak window (default: {SOAK_SNAPSHOT_FILE})")
+    parser.add_argument('--drift-threshold', type=float, default=0.2,
+                        help="relative latency rise over the soak that counts as drift (default: 0.2)")
+    modes.add_argument('--mix', action='store_true',
+                       help="replay a weighted mix of user sessions at a target rate")
+    parser.add_argument('--mix-file', default=None,
+                        help="YAML or JSON scenario for --mix (default: built-in production-like mix)")
+    parser.add_argument('--mix-rate', type=float, default=None,
+                        help="override the scenario's session arrival rate per second")
+    parser.add_argument('--mix-duration', type=float, default=60,
+                        help="seconds of session arrivals for --mix (default: 60)")
+    parser.add_argument('--benchmark-file', default=BENCHMARK_FILE,
+                        help=f"where to write this run's benchmark JSON (default: {BENCHMARK_FILE})")
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help="benchmark JSON to compare against; latency regressions fail the run")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="overwrite --baseline with this run when no regression was found")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="allowed p50 slowdown before a significant change counts (default: 0.10)")
+    parser.add_argument('--alpha', type=float, default=0.01,
+                        help="significance level of the regression test (default: 0.01)")
+    parser.add_argument('--stand-in', action='store_true',
+                        help="start the local stand-in API server and run against it")
+    modes.add_argument('--serve', action='store_true',
+                       help="only run the stand-in API server (in the foreground)")
+    parser.add_argument('--port', type=int, default=0,
+                        help="port for the stand-in server (default: any free port, 3001 with --serve)")
+    parser.add_argument('--stand-in-latency', type=float, default=0.0,
+                        help="fixed latency in ms injected into every stand-in response")
+    parser.add_argument('--stand-in-jitter', type=float, default=0.0,
+                        help="extra uniform random latency in ms for stand-in responses")
+    parser.add_argument('--stand-in-failure-rate', type=float, default=0.0,
+                        help="fraction of stand-in requests that fail with a 500")
+    parser.add_argument('--stand-in-last-modified', action='store_true',
+                        help="make stand-in GETs return Last-Modified and honour If-Modified-Since")
+    parser.add_argument('--stand-in-etags', action='store_true',
+                        help="make stand-in GETs return ETags and honour If-None-Match")
+    parser.add_argument('--stand-in-email-failure-rate', type=float, default=0.0,
+                        help="fraction of stand-in contact submissions whose email delivery fails")
+    parser.add_argument('--stand-in-review-approval-rate', type=float, default=None,
+                        help="fraction of stand-in reviews approved on arrival (default: 0.5 for "
+                             "--write-load, else 0)")
+    args = parser.parse_args()
+
+    stand_in_options = {
+        'latency_ms': args.stand_in_latency,
+        'jitter_ms': args.stand_in_jitter,
+        'failure_rate': args.stand_in_failure_rate,
+        'email_failure_rate': args.stand_in_email_failure_rate,
+        'etags': args.stand_in_etags,
+        'last_modified': args.stand_in_last_modified,
+        'review_approval_rate': args.stand_in_review_approval_rate,
+    }
+    if stand_in_options['review_approval_rate'] is None:
+        # Without approved reviews the --write-load rating check has nothing to verify
+        stand_in_options['review_approval_rate'] = 0.5 if args.write_load else 0.0
+    if args.serve:
+        port = args.port or 3001
+        print(f"🧪 Stand-in API listening on http://127.0.0.1:{port}/api")
+        serve_stand_in('127.0.0.1', port, **stand_in_options)
+        sys.exit(0)
+
+    mix = None
+    if args.mix:
+        try:
+            mix = load_traffic_mix(args.mix_file) if args.mix_file else parse_traffic_mix(DEFAULT_TRAFFIC_MIX)
+            if args.mix_rate is not None:
+                # Re-validated, since a rate <= 0 would schedule sessions forever
+                mix = parse_traffic_mix(dict(mix, rate=args.mix_rate))
+        except (OSError, ValueError, RuntimeError) as e:
+            parser.error(str(e))
+
+    email_sink = None
+    if args.contact_load or (mix and mix_sends_email(mix)):
+        _, email_sink = start_email_sink(port=args.email_sink_port, delay_ms=args.email_delay,
+                                         jitter_ms=args.email_jitter, failure_rate=args.email_failure_rate,
+                                         seed=args.seed)
+        stand_in_options['email_api'] = email_sink
+        print(f"📭 Started email sink at {email_sink}")
+
+    api_base = API_BASE
+    if args.stand_in:
+        _, api_base = start_stand_in(port=args.port, **stand_in_options)
+        print(f"🧪 Started stand-in API at {api_base}")
+
+    def benchmark_ok(mode, results):
+        return record_benchmark(mode, results, args.benchmark_file, args.baseline,
+                                args.tolerance, args.alpha, args.update_baseline, api_base)
+
+    if args.load:
+        levels = [int(level) for level in args.concurrency.split(',')]
+        load_results = run_load(levels, args.duration, api_base, processes=args.processes)
+        no_regression = benchmark_ok('load', load_results)
+        # Fail when a combination never produced a valid response or got slower
+        sys.exit(0 if all(result.successes for result in load_results) and no_regression else 1)
+
+    if args.paginate:
+        limits = [int(limit) for limit in args.limits.split(',')]
+        sweeps, consistent = run_pagination_sweep(limits, api_base, output=args.pagination_output,
+                                                  max_pages=args.max_pages)
+        no_regression = benchmark_ok('pagination', [sweep.result for sweep in sweeps])
+        sys.exit(0 if consistent and no_regression else 1)
+
+    if args.crawl:
+        site_url = api_base[:-len('/api')] if api_base.endswith('/api') else api_base
+        passes = run_crawl(site_url, args.crawl_concurrency, args.warm_pass, slowest=args.slowest)
+        no_regression = benchmark_ok('crawl', [crawl.result for crawl in passes])
+        sys.exit(0 if not any(crawl.result.errors for crawl in passes) and no_regression else 1)
+
+    if args.write_load:
+        write_results, consistent = run_write_load(api_base, args.write_agencies, args.write_requests,
+                                                   args.write_concurrency, args.update_ratio, args.seed)
+        no_regression = benchmark_ok('write', write_results)
+        sys.exit(0 if consistent and no_regression else 1)
+
+    if args.revalidate:
+        report = run_revalidation(api_base, args.revalidate_requests, args.revalidate_concurrency,
+                                  args.validator_cache_size, args.seed)
+        no_regression = benchmark_ok('revalidate', [report.full, report.not_modified])
+        sys.exit(0 if not report.other.errors and no_regression else 1)
+
+    if args.search:
+        search_report = run_search_workload(api_base, args.search_terms, args.search_requests,
+                                            args.search_concurrency, args.zipf, args.seed)
+        search_results = [result for result in search_report.results.values() if result.requests]
+        no_regression = benchmark_ok('search', search_results)
+        sys.exit(0 if not any(result.errors for result in search_results) and no_regression else 1)
+
+    if args.contact_load:
+        contact_report = run_contact_load(api_base, email_sink, args.contact_requests,
+                                          args.contact_concurrency, args.seed)
+        if contact_report.aborted:
+            sys.exit(1)
+        no_regression = benchmark_ok('contact', list(contact_report.total.values()))
+        sys.exit(0 if not contact_report.other_failures and no_regression else 1)
+
+    if args.soak:
+        soak_tester = APITester(pool_size=max(args.pool_size, args.workers), max_retries=args.retries,
+                                api_base=api_base)
+        monitor, drifting = run_soak(soak_tester, SOAK_TESTS, args.soak_duration, args.soak_window, args.parallel,
+                               args.workers, args.results_file, args.soak_snapshot, args.drift_threshold)
+        no_regression = benchmark_ok('soak', list(soak_tester.endpoint_stats.values()))
+        sys.exit(0 if not monitor.failed and not drifting and no_regression else 1)
+
+    if args.mix:
+        mix_report = run_traffic_mix(mix, api_base, args.mix_duration, args.max_connections, args.seed,
+                                     sink_url=email_sink)
+        if mix_report.aborted:
+            sys.exit(1)
+        mix_results = [result for result in mix_report.operations.values() if result.requests]
+        no_regression = benchmark_ok('mix', mix_results)
+        sys.exit(0 if not any(result.errors for result in mix_results) and no_regression else 1)
+
+    if args.open_loop:
+        rates = [float(rate) for rate in args.rates.split(',')]
+        open_results, capacity = run_open_loop(rates, args.duration, args.slo_p99, args.max_error_rate,
+                                               api_base, max_connections=args.max_connections,
+                                               processes=args.processes)
+        no_regression = benchmark_ok('open-loop', open_results)
+        sys.exit(0 if all(rate is not None for rate in capacity.values()) and no_regression else 1)
+
+    # Every worker needs its own pooled connection to avoid blocking on the pool
+    tester = APITester(pool_size=max(args.pool_size, args.workers), max_retries=args.retries,
+                       results_file=args.results_file, api_base=api_base)
+    try:
+        passed, total = tester.run_all_tests(parallel=args.parallel, max_workers=args.workers)
+    finally:
+        tester.results.close()
+    no_regression = benchmark_ok('functional', list(tester.endpoint_stats.values()))
     
     # Exit with appropriate code
-    sys.exit(0 if passed == total else 1)
\ No newline at end of file
+    sys.exit(0 if passed == total and no_regression else 1)
\ No newline at end of file